@@ -4,7 +4,7 @@ import os
 import time
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 from core.signal_processor import process_signal
 from core.chart_analyzer import analyze_chart
 from core.trade_executor import execute_trade
@@ -24,6 +24,35 @@ class SignalModel(BaseModel):
 
 router = APIRouter()
 
+# Chromium instance shared by every chart screenshot (launched on first use)
+_playwright = None
+_browser = None
+_browser_lock = asyncio.Lock()
+
+# Legend entries in the chart pane: one for the main series and one per indicator
+CHART_LEGEND_ITEM_SELECTOR = ".chart-container [data-name='legend-source-item']"
+
+async def get_browser():
+    """Get the shared Chromium browser, launching it on first use or after a crash."""
+    global _playwright, _browser
+    async with _browser_lock:
+        if _browser is None or not _browser.is_connected():
+            if _playwright is None:
+                _playwright = await async_playwright().start()
+            _browser = await _playwright.chromium.launch()
+    return _browser
+
+async def close_browser():
+    """Close the shared Chromium browser and stop Playwright."""
+    global _playwright, _browser
+    async with _browser_lock:
+        if _browser is not None:
+            await _browser.close()
+            _browser = None
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
+
 @router.post("/webhook")
 async def tradingview_webhook(signal: SignalModel):
     logger.info(f"Received signal: {signal}")
@@ -116,9 +145,10 @@ async def take_chart_screenshot(signal):
         
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch()
-            page = await browser.new_page()
+        # Reuse the shared browser; only the page is opened and closed per screenshot
+        browser = await get_browser()
+        page = await browser.new_page()
+        try:
             await page.goto("https://www.tradingview.com/chart/")
             await page.wait_for_selector(".chart-container")
             
@@ -157,18 +187,28 @@ async def take_chart_screenshot(signal):
                 await page.click("button.addIndicator-2U9QKwgs")
                 await page.fill(".search-ZXzPWlJ1 input", indicator)
                 await page.click(f"text={indicator}")
-                await asyncio.sleep(0.5)
             
-            await asyncio.sleep(5)
+            # Wait until the chart pane shows a legend entry for every added indicator
+            # (plus the main series), so the screenshot isn't taken mid-render
+            expected_legend_items = len(indicators_to_add) + 3
+            try:
+                await page.wait_for_function(
+                    "([selector, count]) => document.querySelectorAll(selector).length >= count",
+                    arg=[CHART_LEGEND_ITEM_SELECTOR, expected_legend_items],
+                    timeout=5000
+                )
+            except PlaywrightTimeoutError:
+                logger.warning("Indicators still loading after 5s, taking screenshot anyway")
             
             await page.screenshot(path=filepath)
-            await browser.close()
-            
-            with open(filepath, "rb") as f:
-                screenshot_data = f.read()
-            
-            logger.info(f"Screenshot saved to {filepath}")
-            return screenshot_data
+        finally:
+            await page.close()
+        
+        with open(filepath, "rb") as f:
+            screenshot_data = f.read()
+        
+        logger.info(f"Screenshot saved to {filepath}")
+        return screenshot_data
             
     except Exception as e:
         logger.exception(f"Error taking screenshot: {e}")
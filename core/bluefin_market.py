@@ -6,10 +6,11 @@ It handles the main trading pairs and provides a simple interface for fetching p
 """
 
 import os
+import time
 import logging
 import aiohttp
 import asyncio
-from typing import Dict, List, Optional, Union, Any
+from typing import Dict, List, Optional, Union, Any, Tuple
 import atexit
 import weakref
 import contextlib
@@ -37,6 +38,12 @@ ADDITIONAL_TRADING_PAIRS = [
     "ARB-PERP",   # Arbitrum
 ]
 
+# Maximum number of price requests in flight at once per BluefinMarket instance
+MAX_CONCURRENT_REQUESTS = 8
+
+# Seconds a fetched price is reused before hitting the API again
+PRICE_CACHE_TTL = 0.25
+
 # Track sessions for cleanup
 _SESSIONS = weakref.WeakSet()
 
@@ -85,11 +92,22 @@ class BluefinMarket:
         self.base_url = BLUEFIN_TESTNET_API if use_testnet else BLUEFIN_MAINNET_API
         self.session = None
         self.network = "testnet" if use_testnet else "mainnet"
+        self.request_semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self._price_cache: Dict[str, Tuple[float, float]] = {}
+        self._inflight_prices: Dict[str, asyncio.Future] = {}
         
     async def ensure_session(self):
-        """Ensure aiohttp session is created"""
+        """
+        Ensure the shared aiohttp session is created.
+        
+        Every request made through this instance reuses the session's keep-alive
+        connection pool, so TCP/TLS handshakes are only paid once per host.
+        """
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=30),
+                connector=aiohttp.TCPConnector(limit=100, limit_per_host=20, keepalive_timeout=60, ttl_dns_cache=300)
+            )
             _SESSIONS.add(self.session)
         return self.session
         
@@ -97,12 +115,40 @@ class BluefinMarket:
         """Close the aiohttp session"""
         if self.session and not self.session.closed:
             await self.session.close()
+            _SESSIONS.discard(self.session)
             self.session = None
             
     async def get_price(self, symbol: str) -> Optional[float]:
         """
         Get the current price for a symbol from Bluefin Exchange.
         
+        Concurrent calls for the same symbol share one in-flight request, and a
+        successful price is reused for PRICE_CACHE_TTL seconds, so bursts of
+        lookups (e.g. individual helpers followed by a batch) cost one round-trip.
+        
+        Args:
+            symbol: The trading symbol (e.g., 'SUI-PERP')
+            
+        Returns:
+            float: The current price or None if failed
+        """
+        cached = self._price_cache.get(symbol)
+        if cached is not None and time.monotonic() - cached[0] < PRICE_CACHE_TTL:
+            return cached[1]
+        
+        inflight = self._inflight_prices.get(symbol)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._fetch_price(symbol))
+            self._inflight_prices[symbol] = inflight
+            inflight.add_done_callback(lambda _: self._inflight_prices.pop(symbol, None))
+        
+        # Shield the shared request so one cancelled caller doesn't cancel it for the others
+        return await asyncio.shield(inflight)
+        
+    async def _fetch_price(self, symbol: str) -> Optional[float]:
+        """
+        Fetch the current price for a symbol from the marketData endpoint.
+        
         This method handles the blockchain-specific 18-decimal format and
         converts it to a standard float.
         
@@ -115,52 +161,70 @@ class BluefinMarket:
         url = f"{self.base_url}/marketData?symbol={symbol}"
         
         try:
-            # Use the context manager for session management
-            async with get_session() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        # Try to get the price from different possible fields
-                        price_fields = ['marketPrice', 'oraclePrice', 'indexPrice', 'lastPrice']
-                        
-                        for field in price_fields:
-                            if field in data and data[field]:
-                                # Convert from blockchain native format (with 18 decimals)
-                                raw_price = data[field]
-                                price = float(raw_price) / 1e18
-                                logger.debug(f"Got {symbol} price from {field}: {price}")
-                                return price
-                        
-                        logger.warning(f"No price fields found for {symbol}")
-                    else:
-                        logger.warning(f"Failed to get price for {symbol}: HTTP {response.status}")
+            # Reuse the pooled session for every request
+            session = await self.ensure_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    
+                    # Try to get the price from different possible fields
+                    price_fields = ['marketPrice', 'oraclePrice', 'indexPrice', 'lastPrice']
+                    
+                    for field in price_fields:
+                        if field in data and data[field]:
+                            # Convert from blockchain native format (with 18 decimals)
+                            raw_price = data[field]
+                            price = float(raw_price) / 1e18
+                            logger.debug("Got %s price from %s: %s", symbol, field, price)
+                            self._price_cache[symbol] = (time.monotonic(), price)
+                            return price
+                    
+                    logger.warning("No price fields found for %s", symbol)
+                else:
+                    logger.warning("Failed to get price for %s: HTTP %s", symbol, response.status)
         except Exception as e:
-            logger.error(f"Error fetching price for {symbol}: {e}")
+            logger.error("Error fetching price for %s: %s", symbol, e)
             
         return None
         
-    async def get_main_prices(self) -> Dict[str, Optional[float]]:
+    async def get_prices(self, symbols: List[str]) -> Dict[str, Optional[float]]:
         """
-        Get prices for the main trading pairs.
+        Get prices for several symbols concurrently.
+        
+        At most MAX_CONCURRENT_REQUESTS requests are in flight at once, keeping
+        the load on the Bluefin API within the session's connection pool.
         
+        Args:
+            symbols: The trading symbols to fetch
+            
         Returns:
-            dict: A dictionary mapping symbols to their prices
+            dict: A dictionary mapping symbols to their prices, in input order
         """
-        tasks = [self.get_price(symbol) for symbol in MAIN_TRADING_PAIRS]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def _bounded_price(symbol: str) -> Optional[float]:
+            async with self.request_semaphore:
+                return await self.get_price(symbol)
+        
+        results = await asyncio.gather(*(_bounded_price(symbol) for symbol in symbols), return_exceptions=True)
         
         prices = {}
-        for i, result in enumerate(results):
-            symbol = MAIN_TRADING_PAIRS[i]
+        for symbol, result in zip(symbols, results):
             if isinstance(result, Exception):
-                logger.error(f"Error fetching {symbol} price: {result}")
+                logger.error("Error fetching %s price: %s", symbol, result)
                 prices[symbol] = None
             else:
                 prices[symbol] = result
                 
         return prices
         
+    async def get_main_prices(self) -> Dict[str, Optional[float]]:
+        """
+        Get prices for the main trading pairs.
+        
+        Returns:
+            dict: A dictionary mapping symbols to their prices
+        """
+        return await self.get_prices(MAIN_TRADING_PAIRS)
+        
     async def get_all_prices(self) -> Dict[str, Optional[float]]:
         """
         Get prices for all trading pairs (main + additional).
@@ -168,20 +232,7 @@ class BluefinMarket:
         Returns:
             dict: A dictionary mapping symbols to their prices
         """
-        all_pairs = MAIN_TRADING_PAIRS + ADDITIONAL_TRADING_PAIRS
-        tasks = [self.get_price(symbol) for symbol in all_pairs]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        prices = {}
-        for i, result in enumerate(results):
-            symbol = all_pairs[i]
-            if isinstance(result, Exception):
-                logger.error(f"Error fetching {symbol} price: {result}")
-                prices[symbol] = None
-            else:
-                prices[symbol] = result
-                
-        return prices
+        return await self.get_prices(MAIN_TRADING_PAIRS + ADDITIONAL_TRADING_PAIRS)
         
     async def get_exchange_info(self) -> Optional[List[Dict[str, Any]]]:
         """
@@ -193,15 +244,15 @@ class BluefinMarket:
         url = f"{self.base_url}/exchangeInfo"
         
         try:
-            async with get_session() as session:
-                async with session.get(url) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data
-                    else:
-                        logger.warning(f"Failed to get exchange info: HTTP {response.status}")
+            session = await self.ensure_session()
+            async with session.get(url) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    return data
+                else:
+                    logger.warning("Failed to get exchange info: HTTP %s", response.status)
         except Exception as e:
-            logger.error(f"Error fetching exchange info: {e}")
+            logger.error("Error fetching exchange info: %s", e)
             
         return None
         
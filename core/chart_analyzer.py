@@ -1,12 +1,11 @@
 import asyncio
 import logging
 import base64
-import requests
-import json
 import os
 import datetime
 from typing import Dict, Any, Optional
 
+import aiohttp
 import anthropic
 from dotenv import load_dotenv
 from playwright.sync_api import sync_playwright
@@ -26,9 +25,60 @@ CLAUDE_CONFIG = {
 # Perplexity configuration
 PERPLEXITY_CONFIG = {
     "api_key": os.getenv("PERPLEXITY_API_KEY"),
-    "model": os.getenv("PERPLEXITY_MODEL", "sonar-pro")
+    "model": os.getenv("PERPLEXITY_MODEL", "sonar-pro"),
+    "timeout": int(os.getenv("PERPLEXITY_TIMEOUT", 120))
 }
 
+PERPLEXITY_API_URL = "https://api.perplexity.ai/chat/completions"
+
+# Shared HTTP session for Perplexity calls (installed at startup or created on first use)
+_http_session: Optional[aiohttp.ClientSession] = None
+
+def create_http_session() -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session with a keep-alive connection pool.
+    
+    Requests are bounded by PERPLEXITY_CONFIG["timeout"] so a stalled
+    connection cannot hang an analysis indefinitely.
+    
+    Returns:
+        A new session
+    """
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=PERPLEXITY_CONFIG["timeout"]),
+        connector=aiohttp.TCPConnector(limit=20, limit_per_host=10, keepalive_timeout=60, ttl_dns_cache=300),
+        headers={"Connection": "keep-alive"}
+    )
+
+def set_http_session(session: Optional[aiohttp.ClientSession]):
+    """
+    Install the shared aiohttp session used for Perplexity API calls.
+    
+    Args:
+        session: The session created at application startup, or None to detach it
+    """
+    global _http_session
+    _http_session = session
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session, creating it on first use.
+    
+    Returns:
+        The shared session
+    """
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = create_http_session()
+    return _http_session
+
+async def close_http_session():
+    """Close the shared aiohttp session, if one is open."""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
 def capture_tradingview_screenshot(symbol: Optional[str] = None, timeframe: Optional[str] = None) -> Optional[bytes]:
     """
     Capture a screenshot of the TradingView chart with VuManChu Cipher A/B indicators.
@@ -389,18 +439,14 @@ async def call_perplexity_api(prompt):
     }
     
     try:
-        response = requests.post(
-            "https://api.perplexity.ai/chat/completions",
-            headers=headers,
-            json=data
-        )
-        
-        if response.status_code != 200:
-            error_msg = f"Perplexity API returned an error: {response.status_code} - {response.text}"
-            logger.error(error_msg)
-            raise PerplexityAPIError(error_msg)
+        async with get_http_session().post(PERPLEXITY_API_URL, headers=headers, json=data) as response:
+            if response.status != 200:
+                error_msg = f"Perplexity API returned an error: {response.status} - {await response.text()}"
+                logger.error(error_msg)
+                raise PerplexityAPIError(error_msg)
+            
+            result = await response.json()
         
-        result = response.json()
         content = result["choices"][0]["message"]["content"]
         return content
     
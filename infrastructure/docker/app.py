@@ -370,9 +370,9 @@ def process_cipher_b_signal(symbol, timeframe, action, signal_type, alert_data):
         trade_direction = alert_data.get("trade_direction")
         if not trade_direction:
             # If trade_direction wasn't provided, determine it based on signal type and action
-            if signal_type in ["GREEN_CIRCLE", "GOLD_CIRCLE", "BULL_FLAG", "BULL_DIAMOND"]:
+            if signal_type in {"GREEN_CIRCLE", "GOLD_CIRCLE", "BULL_FLAG", "BULL_DIAMOND"}:
                 trade_direction = "Bullish"
-            elif signal_type in ["RED_CIRCLE", "BEAR_FLAG", "BEAR_DIAMOND"]:
+            elif signal_type in {"RED_CIRCLE", "BEAR_FLAG", "BEAR_DIAMOND"}:
                 trade_direction = "Bearish"
             else:
                 # For ambiguous signals like PURPLE_TRIANGLE or LITTLE_CIRCLE
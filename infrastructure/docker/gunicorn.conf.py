@@ -0,0 +1,27 @@
+"""
+Gunicorn configuration for the TradingView webhook server.
+
+Run with:
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import os
+import multiprocessing
+
+# Bind to the same host/port the Flask dev server uses
+bind = f"{os.getenv('WEBHOOK_HOST', '0.0.0.0')}:{os.getenv('WEBHOOK_PORT', 5001)}"
+
+# One worker process per core, each handling concurrent alerts on a thread pool
+workers = int(os.getenv("WEBHOOK_WORKERS", multiprocessing.cpu_count()))
+worker_class = "gthread"
+threads = int(os.getenv("WEBHOOK_THREADS", 8))
+
+# Keep connections from the reverse proxy open between alerts (matches nginx's
+# default keepalive_timeout so neither side closes an idle connection first)
+keepalive = 75
+timeout = 30
+
+# Log to stdout/stderr so container logs capture requests and errors
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info").lower()
@@ -1,15 +1,24 @@
 import os
-import json
 import logging
+import logging.handlers
 import asyncio
-from datetime import datetime
 import hmac
 import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import sys
+import time
+import queue
+import atexit
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+import orjson
 
 try:
-    from flask import Flask, request, jsonify
+    from flask import Flask, Response, request, jsonify
+    from flask.json.provider import DefaultJSONProvider
 except ImportError:
     print("Error: Flask package not installed. Run: pip install flask")
     sys.exit(1)
@@ -23,24 +32,61 @@ except ImportError:
 # Load environment variables
 load_dotenv()
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("logs/webhook.log"),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger("webhook_server")
-
 # Ensure logs directory exists
 os.makedirs("logs", exist_ok=True)
 
+# Configure logging - request threads only enqueue records; a background listener
+# thread owns the file and stderr handlers so disk writes stay off the request path
+log_formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+log_handlers = [logging.FileHandler("logs/webhook.log"), logging.StreamHandler()]
+for log_handler in log_handlers:
+    log_handler.setFormatter(log_formatter)
+log_queue = queue.SimpleQueue()
+log_listener = logging.handlers.QueueListener(log_queue, *log_handlers)
+log_listener.start()
+atexit.register(log_listener.stop)
+logging.basicConfig(level=logging.INFO, handlers=[logging.handlers.QueueHandler(log_queue)])
+logger = logging.getLogger("webhook_server")
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider that parses request bodies and renders jsonify() responses with orjson."""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
+
+# Worker threads that forward alerts to the agent without blocking the webhook response
+_FORWARD_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="agent-forward")
+atexit.register(_FORWARD_POOL.shutdown, wait=False, cancel_futures=True)
 
-# Valid VuManChu Cipher B signal types with explicit Bullish/Bearish tags
-VALID_SIGNAL_TYPES = [
+# Persistent session so alert forwards reuse keep-alive connections to the agent
+AGENT_SESSION = requests.Session()
+AGENT_SESSION.mount("http://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=32,
+    max_retries=Retry(total=1, backoff_factor=0.1)
+))
+AGENT_SESSION.headers.update({"Content-Type": "application/json"})
+
+# Environment settings read once at import rather than on every request
+AGENT_API_URL = os.getenv("AGENT_API_URL", "http://localhost:5000/api/process_alert")
+IS_DEVELOPMENT = os.getenv("FLASK_ENV") == "development"
+
+# Optional batching: when AGENT_BATCH_URL is set, alerts arriving close together are
+# forwarded to the agent as a single {"alerts": [...]} request instead of one POST each
+AGENT_BATCH_URL = os.getenv("AGENT_BATCH_URL")
+BATCH_MAX_ALERTS = 50
+BATCH_MAX_WAIT = 0.1  # seconds to wait for more alerts after the first one arrives
+_alert_queue = queue.Queue()
+_STOP_BATCHER = object()
+
+# Valid VuManChu Cipher B signal types with explicit Bullish/Bearish tags, in display order
+VALID_SIGNAL_TYPES_DISPLAY = (
     "GREEN_CIRCLE",   # Bullish: Wavetrend waves at oversold level and crossed up
     "RED_CIRCLE",     # Bearish: Wavetrend waves at overbought level and crossed down
     "GOLD_CIRCLE",    # Bullish: Strong Buy - RSI below 20, WaveTrend <= -80, crossed up after bullish divergence
@@ -50,7 +96,24 @@ VALID_SIGNAL_TYPES = [
     "BEAR_FLAG",      # Bearish: MFI+RSI<0, WT>0 and crossed down, VWAP<0 on higher timeframe
     "BULL_DIAMOND",   # Bullish: Pattern with HT green candle
     "BEAR_DIAMOND"    # Bearish: Pattern with HT red candle
-]
+)
+# Hashed set for the per-webhook membership check
+VALID_SIGNAL_TYPES = frozenset(VALID_SIGNAL_TYPES_DISPLAY)
+INVALID_SIGNAL_TYPE_MESSAGE = f"Invalid signal type. Must be one of: {', '.join(VALID_SIGNAL_TYPES_DISPLAY)}"
+
+# String fields every TradingView alert must carry, in the order errors are reported
+REQUIRED_FIELDS = ("indicator", "symbol", "timeframe", "signal_type")
+REQUIRED_FIELD_SET = frozenset(REQUIRED_FIELDS)
+
+# Indicator name (lowercased) of the only alert type this server processes
+VMC_INDICATOR = "vmanchu_cipher_b"
+
+# Shared secret for HMAC-SHA256 request signatures (X-Signature header); when unset,
+# webhooks are accepted unsigned
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "").encode()
+
+# Maps symbol separators to underscores when building alert filenames
+SYMBOL_FILENAME_TABLE = str.maketrans("/-", "__")
 
 # Import core modules
 try:
@@ -60,17 +123,128 @@ except ImportError:
 
     # Fallback implementation
     def process_tradingview_alert(alert_data):
-        logger.info(f"Using fallback signal processor: {alert_data}")
+        logger.info("Using fallback signal processor: %s", alert_data)
         return alert_data
 
+def utcnow_iso():
+    """Return the current UTC time as an ISO 8601 string, formatted straight from time.time()."""
+    now = time.time()
+    return f"{time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(now))}.{int(now % 1 * 1_000_000):06d}"
+
+def static_json_prefix(body):
+    """Encode a constant JSON object, left open for a trailing "timestamp" field."""
+    return orjson.dumps(body)[:-1] + b',"timestamp":"'
+
+# /health and /test bodies never change apart from the timestamp, so they are encoded
+# once and each response only splices the current time in
+HEALTH_RESPONSE_PREFIX = static_json_prefix({"status": "OK", "version": "1.0.0"})
+TEST_RESPONSE_PREFIX = static_json_prefix({
+    "status": "OK",
+    "message": "Webhook server is running",
+    "endpoints": {
+        "webhook": "/webhook (POST)",
+        "health": "/health (GET)"
+    }
+})
+TIMESTAMP_RESPONSE_SUFFIX = b'"}'
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Simple health check endpoint."""
-    return jsonify({
-        "status": "OK", 
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0"
-    })
+    return Response(
+        HEALTH_RESPONSE_PREFIX + utcnow_iso().encode() + TIMESTAMP_RESPONSE_SUFFIX,
+        mimetype="application/json"
+    )
+
+def handle_alert(data):
+    """
+    Validate and process one parsed TradingView alert.
+    
+    Shared by the /webhook and /simulate endpoints so each request is parsed and
+    validated exactly once.
+    
+    Returns:
+        tuple: (response body dict, HTTP status code)
+    """
+    # Validate the payload shape: a JSON object carrying every required string field
+    if not isinstance(data, dict):
+        logger.warning("Received non-object JSON request")
+        return {"status": "error", "message": "Request must be a JSON object"}, 400
+    
+    # Only VuManChu Cipher B alerts are supported, so reject any other indicator
+    # before validating the rest of the payload
+    indicator = data.get("indicator")
+    if isinstance(indicator, str) and indicator.lower() != VMC_INDICATOR:
+        logger.warning("Unsupported indicator: %s", indicator)
+        return {"status": "error", "message": "Unsupported indicator"}, 400
+    
+    # One set comparison on the happy path; find the offending field only on failure
+    if not data.keys() >= REQUIRED_FIELD_SET:
+        field = next(field for field in REQUIRED_FIELDS if field not in data)
+        logger.warning("Missing required field: %s", field)
+        return {"status": "error", "message": f"Missing required field: {field}"}, 400
+    
+    for field in REQUIRED_FIELDS:
+        if not isinstance(data[field], str):
+            logger.warning("Invalid type for field: %s", field)
+            return {"status": "error", "message": f"Field {field} must be a string"}, 400
+    
+    # Validate signal type for VuManChu Cipher B
+    if data["signal_type"] not in VALID_SIGNAL_TYPES:
+        logger.warning("Invalid signal type: %s", data['signal_type'])
+        return {
+            "status": "error", 
+            "message": INVALID_SIGNAL_TYPE_MESSAGE
+        }, 400
+        
+    # Add timestamp if not provided
+    if "timestamp" not in data:
+        data["timestamp"] = utcnow_iso()
+    
+    # Process the alert using the signal processor
+    processed_signal = process_tradingview_alert(data)
+    
+    if not processed_signal:
+        return {
+            "status": "warning",
+            "message": "Alert was received but not processed due to filtering rules"
+        }, 200
+    
+    # Save the processed alert to a file for the agent to pick up
+    save_alert_for_agent(processed_signal)
+    
+    # Return success response
+    return {
+        "status": "success",
+        "message": "Alert received and processed",
+        "data": processed_signal
+    }, 200
+
+def handle_alert_lines(raw_body):
+    """
+    Process a JSON Lines body of TradingView alerts.
+    
+    Args:
+        raw_body: Request body bytes with one JSON alert object per line
+        
+    Returns:
+        list: One response body dict per non-blank line, in order
+    """
+    results = []
+    for line in raw_body.splitlines():
+        if not line.strip():
+            continue
+        try:
+            data = orjson.loads(line)
+        except orjson.JSONDecodeError:
+            logger.warning("Received invalid JSON line in batched webhook")
+            results.append({"status": "error", "message": "Invalid JSON"})
+            continue
+        
+        logger.info("Received webhook: %s", line.decode(errors="replace"))
+        body, _ = handle_alert(data)
+        results.append(body)
+    return results
 
 @app.route('/webhook', methods=['POST'])
 def tradingview_webhook():
@@ -86,8 +260,28 @@ def tradingview_webhook():
         "signal_type": "GREEN_CIRCLE", "RED_CIRCLE", "GOLD_CIRCLE", "PURPLE_TRIANGLE", "LITTLE_CIRCLE", etc.
         "timestamp": "2023-01-01T12:00:00Z"
     }
+    
+    With ?batched=1, the body is JSON Lines (one alert object per line) and the
+    response is a list with one result per alert, in order.
+    
+    If WEBHOOK_SECRET is set, the request must carry an X-Signature header with the
+    hex HMAC-SHA256 of the raw body.
     """
     try:
+        # Read the raw body once; Flask caches it for the JSON parse below
+        raw_body = request.get_data(cache=True)
+        
+        # Verify the request signature when a shared secret is configured
+        if WEBHOOK_SECRET:
+            expected = hmac.new(WEBHOOK_SECRET, raw_body, hashlib.sha256).hexdigest().encode()
+            signature = request.headers.get("X-Signature", "").encode()
+            if not hmac.compare_digest(expected, signature):
+                logger.warning("Rejected webhook with invalid signature")
+                return jsonify({"status": "error", "message": "Invalid signature"}), 401
+        
+        if request.args.get("batched") == "1":
+            return jsonify(handle_alert_lines(raw_body)), 200
+        
         # Get the request data
         if not request.is_json:
             logger.warning("Received non-JSON request")
@@ -98,55 +292,14 @@ def tradingview_webhook():
             logger.warning("Received empty JSON request")
             return jsonify({"status": "error", "message": "Empty JSON request"}), 400
         
-        # Log the received webhook
-        logger.info(f"Received webhook: {json.dumps(data)}")
-        
-        # Validate required fields
-        required_fields = ["indicator", "symbol", "timeframe", "signal_type"]
-        for field in required_fields:
-            if field not in data:
-                logger.warning(f"Missing required field: {field}")
-                return jsonify({"status": "error", "message": f"Missing required field: {field}"}), 400
-        
-        # Validate signal type for VuManChu Cipher B
-        if data["indicator"].lower() == "vmanchu_cipher_b":
-            if data["signal_type"] not in VALID_SIGNAL_TYPES:
-                logger.warning(f"Invalid signal type: {data['signal_type']}")
-                return jsonify({
-                    "status": "error", 
-                    "message": f"Invalid signal type. Must be one of: {', '.join(VALID_SIGNAL_TYPES)}"
-                }), 400
-            
-        # Add timestamp if not provided
-        if "timestamp" not in data:
-            data["timestamp"] = datetime.utcnow().isoformat()
+        # Log the received webhook from the raw body rather than re-encoding the parsed dict
+        logger.info("Received webhook: %s", raw_body.decode(errors="replace"))
         
-        # Process the VuManChu Cipher B alert
-        if data["indicator"].lower() == "vmanchu_cipher_b":
-            # Process the alert using the signal processor
-            processed_signal = process_tradingview_alert(data)
-            
-            if not processed_signal:
-                return jsonify({
-                    "status": "warning",
-                    "message": "Alert was received but not processed due to filtering rules"
-                }), 200
-            
-            # Save the processed alert to a file for the agent to pick up
-            save_alert_for_agent(processed_signal)
-            
-            # Return success response
-            return jsonify({
-                "status": "success",
-                "message": "Alert received and processed",
-                "data": processed_signal
-            })
-        else:
-            logger.warning(f"Unsupported indicator: {data['indicator']}")
-            return jsonify({"status": "error", "message": "Unsupported indicator"}), 400
+        body, status_code = handle_alert(data)
+        return jsonify(body), status_code
             
     except Exception as e:
-        logger.error(f"Error processing webhook: {str(e)}", exc_info=True)
+        logger.error("Error processing webhook: %s", e, exc_info=True)
         return jsonify({"status": "error", "message": str(e)}), 500
 
 def save_alert_for_agent(alert_data):
@@ -155,65 +308,113 @@ def save_alert_for_agent(alert_data):
         # Create alerts directory if it doesn't exist
         os.makedirs("alerts", exist_ok=True)
         
-        # Generate a filename based on timestamp and symbol
-        timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-        symbol = alert_data["symbol"].replace("/", "_").replace("-", "_")
-        filename = f"alerts/alert_{timestamp}_{symbol}.json"
+        # Generate a filename based on timestamp and symbol; the random suffix keeps
+        # alerts for the same symbol within one second (e.g. in a batch) from colliding
+        timestamp = time.strftime("%Y%m%d%H%M%S", time.gmtime())
+        symbol = alert_data["symbol"].translate(SYMBOL_FILENAME_TABLE)
+        filename = f"alerts/alert_{timestamp}_{symbol}_{uuid.uuid4().hex}.json"
         
         # Write the alert data to the file
-        with open(filename, "w") as f:
-            json.dump(alert_data, f, indent=2)
+        with open(filename, "wb") as f:
+            f.write(orjson.dumps(alert_data, option=orjson.OPT_INDENT_2))
             
-        logger.info(f"Alert saved to file: {filename}")
+        logger.info("Alert saved to file: %s", filename)
         
         # Notify the agent directly
         notify_agent(alert_data)
     
     except Exception as e:
-        logger.error(f"Error saving alert: {str(e)}", exc_info=True)
+        logger.error("Error saving alert: %s", e, exc_info=True)
+
+def send_notification(agent_api_url, alert_data):
+    """Forward an alert to the agent API, logging rather than raising on failure."""
+    try:
+        response = AGENT_SESSION.post(
+            agent_api_url, 
+            data=orjson.dumps(alert_data), 
+            timeout=2
+        )
+        if response.status_code == 200:
+            logger.info("Alert successfully forwarded to agent")
+        else:
+            logger.warning("Agent returned non-200 status code: %s", response.status_code)
+    except requests.exceptions.RequestException as e:
+        logger.warning("Could not forward alert to agent: %s", e)
+
+def send_batch(alerts):
+    """Forward a batch of alerts to the agent's batch API in one request."""
+    try:
+        response = AGENT_SESSION.post(
+            AGENT_BATCH_URL, 
+            data=orjson.dumps({"alerts": alerts}), 
+            timeout=2
+        )
+        if response.status_code == 200:
+            logger.info("Batch of %s alerts successfully forwarded to agent", len(alerts))
+        else:
+            logger.warning("Agent returned non-200 status code for batch: %s", response.status_code)
+    except requests.exceptions.RequestException as e:
+        logger.warning("Could not forward alert batch to agent: %s", e)
+
+def batch_forwarder():
+    """
+    Drain the alert queue, forwarding up to BATCH_MAX_ALERTS alerts per request.
+    
+    Blocks until an alert arrives, then keeps collecting for at most BATCH_MAX_WAIT
+    seconds before sending. Exits after flushing once the stop sentinel is queued.
+    """
+    stopping = False
+    while not stopping:
+        item = _alert_queue.get()
+        if item is _STOP_BATCHER:
+            break
+        batch = [item]
+        deadline = time.monotonic() + BATCH_MAX_WAIT
+        while len(batch) < BATCH_MAX_ALERTS:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = _alert_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if item is _STOP_BATCHER:
+                stopping = True
+                break
+            batch.append(item)
+        send_batch(batch)
+
+def stop_batch_forwarder():
+    """Flush any queued alerts and stop the batch forwarder thread."""
+    _alert_queue.put(_STOP_BATCHER)
+    _batch_thread.join(timeout=5)
+
+if AGENT_BATCH_URL:
+    _batch_thread = threading.Thread(target=batch_forwarder, name="agent-batch-forward", daemon=True)
+    _batch_thread.start()
+    atexit.register(stop_batch_forwarder)
 
 def notify_agent(alert_data):
     """Notify the agent of a new alert via API."""
     try:
-        agent_api_url = os.getenv("AGENT_API_URL", "http://localhost:5000/api/process_alert")
+        # Queue for the batch forwarder when batching is enabled
+        if AGENT_BATCH_URL:
+            _alert_queue.put(alert_data)
+            return
         
-        # Send asynchronously to avoid blocking
-        def send_notification():
-            try:
-                response = requests.post(
-                    agent_api_url, 
-                    json=alert_data, 
-                    timeout=2,
-                    headers={"Content-Type": "application/json"}
-                )
-                if response.status_code == 200:
-                    logger.info("Alert successfully forwarded to agent")
-                else:
-                    logger.warning(f"Agent returned non-200 status code: {response.status_code}")
-            except requests.exceptions.RequestException as e:
-                logger.warning(f"Could not forward alert to agent: {str(e)}")
-        
-        # Run in a separate thread to avoid blocking
-        from threading import Thread
-        thread = Thread(target=send_notification)
-        thread.daemon = True
-        thread.start()
+        # Hand off to the shared worker pool so the webhook response isn't blocked
+        _FORWARD_POOL.submit(send_notification, AGENT_API_URL, alert_data)
         
     except Exception as e:
-        logger.error(f"Error notifying agent: {str(e)}", exc_info=True)
+        logger.error("Error notifying agent: %s", e, exc_info=True)
 
 @app.route('/test', methods=['GET'])
 def test_endpoint():
     """Test endpoint to verify the webhook server is working."""
-    return jsonify({
-        "status": "OK",
-        "message": "Webhook server is running",
-        "timestamp": datetime.utcnow().isoformat(),
-        "endpoints": {
-            "webhook": "/webhook (POST)",
-            "health": "/health (GET)"
-        }
-    })
+    return Response(
+        TEST_RESPONSE_PREFIX + utcnow_iso().encode() + TIMESTAMP_RESPONSE_SUFFIX,
+        mimetype="application/json"
+    )
 
 @app.route('/simulate', methods=['POST'])
 def simulate_webhook():
@@ -231,7 +432,7 @@ def simulate_webhook():
     """
     try:
         # This endpoint only works in development mode
-        if os.getenv("FLASK_ENV") != "development":
+        if not IS_DEVELOPMENT:
             return jsonify({"status": "error", "message": "This endpoint is only available in development mode"}), 403
             
         # Get the request data
@@ -243,19 +444,14 @@ def simulate_webhook():
             return jsonify({"status": "error", "message": "Empty JSON request"}), 400
         
         # Log that we're simulating a webhook
-        logger.info(f"Simulating webhook with data: {json.dumps(data)}")
-        
-        # Add timestamp if not provided
-        if "timestamp" not in data:
-            data["timestamp"] = datetime.utcnow().isoformat()
-            
-        # Forward to the webhook endpoint
-        response = tradingview_webhook()
+        logger.info("Simulating webhook with data: %s", request.get_data(as_text=True))
         
-        return response
+        # Run the alert through the same handler as the webhook endpoint
+        body, status_code = handle_alert(data)
+        return jsonify(body), status_code
             
     except Exception as e:
-        logger.error(f"Error simulating webhook: {str(e)}", exc_info=True)
+        logger.error("Error simulating webhook: %s", e, exc_info=True)
         return jsonify({"status": "error", "message": str(e)}), 500
 
 if __name__ == "__main__":
@@ -281,8 +477,6 @@ if __name__ == "__main__":
     if use_ngrok:
         try:
             import subprocess
-            import time
-            import json
             
             # Check if ngrok is installed
             try:
@@ -297,13 +491,21 @@ if __name__ == "__main__":
                 # Start ngrok in the background
                 subprocess.Popen(ngrok_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
                 
-                # Wait for ngrok to start
-                time.sleep(3)
+                # Poll the ngrok API until a tunnel is up rather than sleeping a fixed time
+                tunnels = []
+                deadline = time.monotonic() + 5
+                while time.monotonic() < deadline:
+                    try:
+                        tunnels = AGENT_SESSION.get("http://localhost:4040/api/tunnels", timeout=0.5).json()["tunnels"]
+                        if tunnels:
+                            break
+                    except (requests.RequestException, ValueError, KeyError):
+                        pass
+                    time.sleep(0.1)
                 
                 # Get the public URL from the ngrok API
                 try:
-                    ngrok_api = requests.get("http://localhost:4040/api/tunnels").json()
-                    public_url = ngrok_api["tunnels"][0]["public_url"]
+                    public_url = tunnels[0]["public_url"]
                     print(f"Ngrok TCP tunnel established: {public_url}")
                     print(f"Use this address for your TradingView webhooks")
                     
@@ -322,6 +524,8 @@ if __name__ == "__main__":
             print("Ngrok Python package not installed. Continuing without ngrok...")
     
     print("==================================================\n")
+    print("Note: this is Flask's development server. For production, run:")
+    print("   gunicorn -c gunicorn.conf.py wsgi:app\n")
     
     # Start the Flask app
     app.run(host=host, port=port, debug=debug_mode) 
\ No newline at end of file
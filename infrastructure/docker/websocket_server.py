@@ -9,6 +9,7 @@ import os
 import json
 import logging
 import time
+import threading
 from flask import Flask, jsonify
 from flask_socketio import SocketIO, emit, request
 from flask_cors import CORS
@@ -34,8 +35,14 @@ port = int(os.environ.get('SOCKET_PORT', 5001))
 # Initialize Socket.IO
 socketio = SocketIO(app, cors_allowed_origins="*")
 
-# Store connected clients
+# Store connected clients by Socket.IO session id
 connected_clients = set()
+clients_lock = threading.Lock()
+
+def client_count():
+    """Return the number of currently connected clients"""
+    with clients_lock:
+        return len(connected_clients)
 
 @app.route('/health')
 def health_check():
@@ -46,7 +53,7 @@ def health_check():
             "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
             "version": os.environ.get("APP_VERSION", "1.0.0"),
             "environment": os.environ.get("FLASK_ENV", "development"),
-            "connected_clients": len(connected_clients)
+            "connected_clients": client_count()
         }
         return jsonify(status)
     except Exception as e:
@@ -60,13 +67,17 @@ def health_check():
 @socketio.on('connect')
 def handle_connect():
     """Handle client connection"""
-    logger.info(f"Client connected")
+    with clients_lock:
+        connected_clients.add(request.sid)
+    logger.info(f"Client connected: {request.sid}")
     emit('connection_status', {'status': 'connected'})
 
 @socketio.on('disconnect')
 def handle_disconnect():
     """Handle client disconnection"""
-    logger.info(f"Client disconnected")
+    with clients_lock:
+        connected_clients.discard(request.sid)
+    logger.info(f"Client disconnected: {request.sid}")
 
 @socketio.on('subscribe')
 def handle_subscribe(data):
@@ -79,7 +90,7 @@ def handle_subscribe(data):
 def broadcast_update(event_type, data):
     """Broadcast an update to all connected clients"""
     socketio.emit(event_type, data)
-    logger.info(f"Broadcasted {event_type} event to {len(connected_clients)} clients")
+    logger.info(f"Broadcasted {event_type} event to {client_count()} clients")
 
 if __name__ == '__main__':
     logger.info(f"Starting WebSocket server on port {port}")
@@ -0,0 +1,10 @@
+"""
+WSGI entry point for the TradingView webhook server.
+
+Run with:
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from webhook_server import app
+
+__all__ = ["app"]
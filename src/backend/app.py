@@ -4,6 +4,7 @@ import logging
 import time
 import subprocess
 import threading
+import uuid
 from core.config import (
     TRADING_PARAMS, 
     RISK_PARAMS, 
@@ -371,70 +372,109 @@ def process_alert():
         if data is None:
             return jsonify({"status": "error", "message": "No JSON data provided"}), 400
             
-        # Log the received alert
-        logger.info(f"Received alert from webhook server: {json.dumps(data, indent=2)}")
-        
-        # Basic validation
-        if 'type' not in data or 'symbol' not in data:
-            return jsonify({"status": "error", "message": "Alert must contain at least 'type' and 'symbol' fields"}), 400
+        body, status_code = handle_alert(data)
+        return jsonify(body), status_code
             
-        # Save the alert to a file for reference
-        os.makedirs("alerts", exist_ok=True)
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        symbol = data.get("symbol", "unknown").replace('/', '_').replace('-', '_')
-        filename = f"alerts/alert_{timestamp}_{symbol}.json"
-        with open(filename, "w") as f:
-            json.dump(data, f, indent=2)
-        logger.info(f"Saved alert to {filename}")
+    except Exception as e:
+        logger.error(f"Error processing alert: {e}", exc_info=True)
+        return jsonify({"status": "error", "message": str(e)}), 500
+
+@app.route('/api/process_alerts_batch', methods=['POST'])
+def process_alerts_batch():
+    """Process a batch of trading alerts forwarded together by the webhook server"""
+    try:
+        data = request.json
         
-        # Process based on indicator or type
-        indicator = data.get("original_alert", {}).get("indicator", "").lower() if "original_alert" in data else ""
+        # Check that a list of alerts was provided
+        if data is None or not isinstance(data.get("alerts"), list):
+            return jsonify({"status": "error", "message": "Batch must contain an 'alerts' list"}), 400
         
-        # Handle VuManChu signals specifically
-        if indicator == "vmanchu cipher b":
-            try:
-                # Extract relevant fields from the nested structure
-                original_alert = data.get("original_alert", {})
-                symbol = data.get("symbol", "")
-                timeframe = data.get("timeframe", "")
-                action = data.get("type", "").upper()
-                signal_type = data.get("signal_type", "UNKNOWN")
-                
-                logger.info(f"Processing VuManChu signal: {symbol} {timeframe} {action} {signal_type}")
-                result = process_cipher_b_signal(symbol, timeframe, action, signal_type, original_alert)
-                return jsonify({"status": "success", "message": "VuManChu alert processed", "result": result})
-            except Exception as e:
-                logger.error(f"Error processing VuManChu signal: {e}")
-                return jsonify({"status": "error", "message": f"Error processing VuManChu signal: {str(e)}"}), 500
+        logger.info(f"Received batch of {len(data['alerts'])} alerts from webhook server")
         
-        # Handle general signals
-        else:
-            # For now, just acknowledge receipt and log
-            logger.info(f"Received general trading signal: {data.get('type')} for {data.get('symbol')}")
-            
-            # Emit update via socketio for real-time dashboard updates
+        # Handle each alert independently so one bad alert doesn't fail the batch
+        results = []
+        for alert in data["alerts"]:
             try:
-                emit_update('alert_received', {
-                    'timestamp': timestamp,
-                    'symbol': data.get('symbol'),
-                    'type': data.get('type'),
-                    'action': data.get('type'),  # Usually buy/sell
-                    'timeframe': data.get('timeframe', 'unknown'),
-                    'signal_type': data.get('signal_type', 'unknown')
-                })
+                body, _ = handle_alert(alert)
             except Exception as e:
-                logger.warning(f"Could not emit socket update: {e}")
-            
-            return jsonify({
-                "status": "success", 
-                "message": "Alert acknowledged",
-                "alert_id": f"{timestamp}_{symbol}"
-            })
-            
+                logger.error(f"Error processing alert: {e}", exc_info=True)
+                body = {"status": "error", "message": str(e)}
+            results.append(body)
+        
+        return jsonify({"status": "success", "results": results})
+        
     except Exception as e:
-        logger.error(f"Error processing alert: {e}", exc_info=True)
+        logger.error(f"Error processing alert batch: {e}", exc_info=True)
         return jsonify({"status": "error", "message": str(e)}), 500
 
+def handle_alert(data):
+    """
+    Validate, save and dispatch a single alert from the webhook server.
+    
+    Returns:
+        tuple: (response body dict, HTTP status code)
+    """
+    # Log the received alert
+    logger.info(f"Received alert from webhook server: {json.dumps(data, indent=2)}")
+    
+    # Basic validation
+    if 'type' not in data or 'symbol' not in data:
+        return {"status": "error", "message": "Alert must contain at least 'type' and 'symbol' fields"}, 400
+        
+    # Save the alert to a file for reference
+    os.makedirs("alerts", exist_ok=True)
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
+    symbol = data.get("symbol", "unknown").replace('/', '_').replace('-', '_')
+    # The random suffix keeps alerts for the same symbol within one second from colliding
+    filename = f"alerts/alert_{timestamp}_{symbol}_{uuid.uuid4().hex}.json"
+    with open(filename, "w") as f:
+        json.dump(data, f, indent=2)
+    logger.info(f"Saved alert to {filename}")
+    
+    # Process based on indicator or type
+    indicator = data.get("original_alert", {}).get("indicator", "").lower() if "original_alert" in data else ""
+    
+    # Handle VuManChu signals specifically
+    if indicator == "vmanchu cipher b":
+        try:
+            # Extract relevant fields from the nested structure
+            original_alert = data.get("original_alert", {})
+            symbol = data.get("symbol", "")
+            timeframe = data.get("timeframe", "")
+            action = data.get("type", "").upper()
+            signal_type = data.get("signal_type", "UNKNOWN")
+            
+            logger.info(f"Processing VuManChu signal: {symbol} {timeframe} {action} {signal_type}")
+            result = process_cipher_b_signal(symbol, timeframe, action, signal_type, original_alert)
+            return {"status": "success", "message": "VuManChu alert processed", "result": result}, 200
+        except Exception as e:
+            logger.error(f"Error processing VuManChu signal: {e}")
+            return {"status": "error", "message": f"Error processing VuManChu signal: {str(e)}"}, 500
+    
+    # Handle general signals
+    else:
+        # For now, just acknowledge receipt and log
+        logger.info(f"Received general trading signal: {data.get('type')} for {data.get('symbol')}")
+        
+        # Emit update via socketio for real-time dashboard updates
+        try:
+            emit_update('alert_received', {
+                'timestamp': timestamp,
+                'symbol': data.get('symbol'),
+                'type': data.get('type'),
+                'action': data.get('type'),  # Usually buy/sell
+                'timeframe': data.get('timeframe', 'unknown'),
+                'signal_type': data.get('signal_type', 'unknown')
+            })
+        except Exception as e:
+            logger.warning(f"Could not emit socket update: {e}")
+        
+        return {
+            "status": "success", 
+            "message": "Alert acknowledged",
+            "alert_id": f"{timestamp}_{symbol}"
+        }, 200
+
 def process_cipher_b_signal(symbol, timeframe, action, signal_type, alert_data):
     """Process a VuManChu Cipher B signal and make a trading decision"""
     try:
@@ -442,9 +482,9 @@ def process_cipher_b_signal(symbol, timeframe, action, signal_type, alert_data):
         trade_direction = alert_data.get("trade_direction")
         if not trade_direction:
             # If trade_direction wasn't provided, determine it based on signal type and action
-            if signal_type in ["GREEN_CIRCLE", "GOLD_CIRCLE", "BULL_FLAG", "BULL_DIAMOND"]:
+            if signal_type in {"GREEN_CIRCLE", "GOLD_CIRCLE", "BULL_FLAG", "BULL_DIAMOND"}:
                 trade_direction = "Bullish"
-            elif signal_type in ["RED_CIRCLE", "BEAR_FLAG", "BEAR_DIAMOND"]:
+            elif signal_type in {"RED_CIRCLE", "BEAR_FLAG", "BEAR_DIAMOND"}:
                 trade_direction = "Bearish"
             else:
                 # For ambiguous signals like PURPLE_TRIANGLE or LITTLE_CIRCLE
@@ -44,10 +44,13 @@ import json
 import asyncio
 import random
 import logging
+import logging.handlers
+import queue
 import traceback
 from datetime import datetime, timedelta
 from pathlib import Path
 import backoff
+import orjson
 from dotenv import load_dotenv
 try:
     from playwright.async_api import async_playwright
@@ -58,11 +61,20 @@ except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     async_playwright = None
     sync_playwright = None
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    logging.warning("watchdog not installed. The alerts directory will be polled.")
+    WATCHDOG_AVAILABLE = False
+    Observer = None
+    FileSystemEventHandler = object
 from typing import Dict, List, Optional, Union, Any, TypeVar, Type, cast
 import requests
 import base64
 import aiohttp
-from anthropic import Client, RateLimitError, APITimeoutError
+from anthropic import AsyncAnthropic, RateLimitError, APITimeoutError
 import re
 import tempfile
 import argparse
@@ -88,22 +100,37 @@ except ImportError:
 
 # Configure logging first
 def setup_logging():
-    """Set up logging configuration."""
-    log_format = json.dumps({
+    """
+    Set up logging configuration.
+    
+    Log calls only enqueue records; a QueueListener thread does the file and console
+    writes so the alert loop never blocks on log I/O.
+    
+    Returns:
+        The started QueueListener, to be stopped on shutdown
+    """
+    log_format = logging.Formatter(json.dumps({
         "timestamp": "%(asctime)s",
         "level": "%(levelname)s",
         "module": "%(module)s",
         "message": "%(message)s"
-    })
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format=log_format,
-        handlers=[
-            logging.FileHandler(f"logs/trading_log_{int(datetime.now().timestamp())}.log"),
-            logging.StreamHandler()
-        ]
-    )
+    }))
+    
+    handlers = [
+        logging.FileHandler(f"logs/trading_log_{int(datetime.now().timestamp())}.log", delay=True),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(log_format)
+    
+    log_queue = queue.Queue(-1)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
 
 logger = logging.getLogger("bluefin_agent")
 
@@ -187,7 +214,7 @@ claude_client = None
 
 # Import Anthropic API for Claude
 try:
-    from anthropic import Client, RateLimitError, APITimeoutError
+    from anthropic import AsyncAnthropic, RateLimitError, APITimeoutError
     CLAUDE_AVAILABLE = True
 except ImportError:
     logger.warning("Anthropic Python SDK not installed. Claude AI will not be available.")
@@ -257,6 +284,9 @@ class MockNetworks:
 # Set up Networks
 Networks = MockNetworks()
 
+# Network names, computed once for the diagnostic log in init_bluefin_client
+_VISIBLE_NETWORKS = tuple(name for name in dir(Networks) if name.isupper())
+
 # Update BluefinClient variable definition
 BluefinClient = None  # Will be set to either the real client or MockBluefinClient
 
@@ -656,10 +686,13 @@ async def get_account_info(client):
     try:
         # Get account data based on API
         if hasattr(client, 'get_user_account_data'):
-            # bluefin_client_sui approach
-            account_data = await client.get_user_account_data()
-            margin_data = await client.get_user_margin()
-            positions = await client.get_user_positions() or []
+            # bluefin_client_sui approach - the three calls are independent, so overlap them
+            account_data, margin_data, positions = await asyncio.gather(
+                client.get_user_account_data(),
+                client.get_user_margin(),
+                client.get_user_positions()
+            )
+            positions = positions or ()
             
             account_info = {
                 "balance": float(account_data.get("totalCollateralValue", 0)),
@@ -746,7 +779,7 @@ def init_bluefin_client():
                         network_value = Networks[network]
                     else:
                         logger.warning(f"Network {network} not found in available networks")
-                        logger.warning(f"Available networks: {dir(Networks) if hasattr(Networks, '__dict__') else list(Networks.keys()) if hasattr(Networks, 'keys') else 'Unknown'}")
+                        logger.debug("Available networks: %s", _VISIBLE_NETWORKS)
                         logger.warning("Falling back to SUI_PROD")
                         network = "SUI_PROD"
                         if hasattr(Networks, network):
@@ -785,7 +818,7 @@ def init_bluefin_client():
     return client
 
 
-def init_claude_client():
+async def init_claude_client():
     """Initialize the Claude API client using environment variables"""
     global claude_client
     
@@ -810,13 +843,13 @@ def init_claude_client():
         logger.info(f"Initializing Claude client with Anthropic API key")
         logger.info(f"Primary model: {primary_model}, Fallback model: {fallback_model}")
         
-        claude_client = Client(api_key=api_key, max_retries=3)
+        claude_client = AsyncAnthropic(api_key=api_key, max_retries=3)
         
         # Test the primary model
         try:
             logger.info(f"Testing primary model: {primary_model}")
             # Try a simple message to verify the model works
-            response = claude_client.messages.create(
+            response = await claude_client.messages.create(
                 model=primary_model,
                 max_tokens=10,
                 messages=[
@@ -832,7 +865,7 @@ def init_claude_client():
             
             try:
                 # Try the fallback model
-                response = claude_client.messages.create(
+                response = await claude_client.messages.create(
                     model=fallback_model,
                     max_tokens=10,
                     messages=[
@@ -861,7 +894,7 @@ def init_claude_client():
         
         # Initialize Claude client with API key
         logger.info("Initializing Claude client with Anthropic API key")
-        claude_client = Client(api_key=api_key, max_retries=3)
+        claude_client = AsyncAnthropic(api_key=api_key, max_retries=3)
         
         return claude_client
     except Exception as e:
@@ -920,7 +953,7 @@ async def init_clients():
     
     # Initialize Claude client 
     logger.info("Initializing Claude client")
-    claude_client = init_claude_client()
+    claude_client = await init_claude_client()
     if claude_client:
         logger.info("Claude client initialized successfully")
     else:
@@ -983,6 +1016,17 @@ def capture_chart_screenshot(ticker, timeframe="1D"):
         logger.error(f"Error capturing chart screenshot: {e}")
         return None
 
+# Pooled HTTP session reused for every Perplexity request (created on first use)
+perplexity_session = None
+
+def get_perplexity_session():
+    """Get the shared requests session for Perplexity calls, creating it on first use"""
+    global perplexity_session
+    if perplexity_session is None:
+        perplexity_session = requests.Session()
+        perplexity_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=10))
+    return perplexity_session
+
 def analyze_chart_with_perplexity(screenshot_path, ticker):
     """Analyze a chart screenshot using Perplexity AI"""
     # Get API key from environment
@@ -1013,7 +1057,7 @@ def analyze_chart_with_perplexity(screenshot_path, ticker):
     }
     
     # Send to Perplexity API
-    response = requests.post("https://api.perplexity.ai/chat/completions", json=prompt, headers=headers)
+    response = get_perplexity_session().post("https://api.perplexity.ai/chat/completions", json=prompt, headers=headers)
     
     # Process response
     if response.status_code == 200:
@@ -1079,8 +1123,8 @@ Format your analysis in a structured way with clear sections."""
         # Make API call to Claude
         logger.info(f"Sending chart analysis request to Claude for {ticker}")
         
-        # Create message with anthropic.Client - using correct schema
-        response = claude_client.messages.create(
+        # Create message with the async client so the request doesn't block the event loop
+        response = await claude_client.messages.create(
             model=model,
             max_tokens=max_tokens,
             temperature=temperature,
@@ -1156,6 +1200,19 @@ Format your analysis in a structured way with clear sections."""
         logger.error(f"Error in Claude chart analysis: {str(e)}")
         return {"error": f"Claude analysis error: {str(e)}"}
 
+# Patterns for extracting trade levels from model analysis text, compiled once at import
+CONFIDENCE_RE = re.compile(r"confidence[:\s]+(\d+)(?:\s*\/\s*10)?")
+ENTRY_RE = re.compile(r"entry[:\s]+[$]?(\d+(?:\.\d+)?)")
+STOP_LOSS_RE = re.compile(r"stop[:\s]*loss[:\s]+[$]?(\d+(?:\.\d+)?)")
+TAKE_PROFIT_RE = re.compile(r"take[:\s]*profit[:\s]+[$]?(\d+(?:\.\d+)?)")
+RISK_REWARD_RE = re.compile(r"risk[:/]reward[:\s]+(\d+(?:\.\d+)?)[:\s]*(?:to)[:\s]*(\d+(?:\.\d+)?)")
+BUY_RECOMMENDATION_RE = re.compile(r'recommendation.*?\b(buy|long)\b|\b(buy|long)\b.*?recommended')
+SELL_RECOMMENDATION_RE = re.compile(r'recommendation.*?\b(sell|short)\b|\b(sell|short)\b.*?recommended')
+HOLD_RECOMMENDATION_RE = re.compile(r'recommendation.*?\b(hold|neutral|accumulate)\b|\b(hold|neutral|accumulate)\b.*?recommended')
+PRICE_RE = re.compile(r"(?:current|price|trading at)[:\s]+\$?(\d+(?:\.\d+)?)")
+SUPPORT_RE = re.compile(r"(?:stop[- ]loss|support)[:\s]+\$?(\d+(?:\.\d+)?)")
+RESISTANCE_RE = re.compile(r"(?:take[- ]profit|target|resistance)[:\s]+\$?(\d+(?:\.\d+)?)")
+
 def parse_claude_analysis(analysis_text, ticker):
     """
     Parse Claude's analysis to extract trading recommendations
@@ -1180,43 +1237,47 @@ def parse_claude_analysis(analysis_text, ticker):
     }
     
     try:
+        # Normalise case once; every check below scans these copies
+        text = analysis_text.lower()
+        text_upper = analysis_text.upper()
+        
         # Extract action (BUY/SELL/HOLD)
-        if "BUY" in analysis_text.upper() or "LONG" in analysis_text.upper():
+        if "BUY" in text_upper or "LONG" in text_upper:
             recommendation["action"] = "BUY"
-        elif "SELL" in analysis_text.upper() or "SHORT" in analysis_text.upper():
+        elif "SELL" in text_upper or "SHORT" in text_upper:
             recommendation["action"] = "SELL"
-        elif "HOLD" in analysis_text.upper() or "NEUTRAL" in analysis_text.upper():
+        elif "HOLD" in text_upper or "NEUTRAL" in text_upper:
             recommendation["action"] = "NONE"
             
         # Extract trend
-        if "BULLISH" in analysis_text.upper():
+        if "BULLISH" in text_upper:
             recommendation["trend"] = "BULLISH"
-        elif "BEARISH" in analysis_text.upper():
+        elif "BEARISH" in text_upper:
             recommendation["trend"] = "BEARISH"
             
         # Extract confidence score (1-10)
-        confidence_match = re.search(r"confidence[:\s]+(\d+)(?:\s*\/\s*10)?", analysis_text.lower())
+        confidence_match = CONFIDENCE_RE.search(text)
         if confidence_match:
             recommendation["confidence"] = int(confidence_match.group(1))
             
         # Extract price levels (using regex)
         # Entry price
-        entry_match = re.search(r"entry[:\s]+[$]?(\d+(?:\.\d+)?)", analysis_text.lower())
+        entry_match = ENTRY_RE.search(text)
         if entry_match:
             recommendation["entry_price"] = float(entry_match.group(1))
             
         # Stop loss
-        sl_match = re.search(r"stop[:\s]*loss[:\s]+[$]?(\d+(?:\.\d+)?)", analysis_text.lower())
+        sl_match = STOP_LOSS_RE.search(text)
         if sl_match:
             recommendation["stop_loss"] = float(sl_match.group(1))
             
         # Take profit
-        tp_match = re.search(r"take[:\s]*profit[:\s]+[$]?(\d+(?:\.\d+)?)", analysis_text.lower())
+        tp_match = TAKE_PROFIT_RE.search(text)
         if tp_match:
             recommendation["take_profit"] = float(tp_match.group(1))
             
         # Risk/reward ratio
-        rr_match = re.search(r"risk[:/]reward[:\s]+(\d+(?:\.\d+)?)[:\s]*(?:to)[:\s]*(\d+(?:\.\d+)?)", analysis_text.lower())
+        rr_match = RISK_REWARD_RE.search(text)
         if rr_match:
             reward = float(rr_match.group(2))
             risk = float(rr_match.group(1))
@@ -1295,18 +1356,21 @@ def parse_perplexity_analysis(analysis, ticker):
         # Debug: Print the extracted text
         logger.info(f"Extracted analysis text: {analysis_text[:200]}...")
         
+        # Lowercase once; every check below scans this copy
+        text = analysis_text.lower()
+        
         # Detect recommendation type based on explicit statements
         recommendation_type = "NONE"
         confidence = 0.0
         
         # Look for explicit recommendations
-        if re.search(r'recommendation.*?\b(buy|long)\b', analysis_text.lower()) or re.search(r'\b(buy|long)\b.*?recommended', analysis_text.lower()):
+        if BUY_RECOMMENDATION_RE.search(text):
             recommendation_type = "BUY"
             confidence = 0.8
-        elif re.search(r'recommendation.*?\b(sell|short)\b', analysis_text.lower()) or re.search(r'\b(sell|short)\b.*?recommended', analysis_text.lower()):
+        elif SELL_RECOMMENDATION_RE.search(text):
             recommendation_type = "SELL"
             confidence = 0.8
-        elif re.search(r'recommendation.*?\b(hold|neutral|accumulate)\b', analysis_text.lower()) or re.search(r'\b(hold|neutral|accumulate)\b.*?recommended', analysis_text.lower()):
+        elif HOLD_RECOMMENDATION_RE.search(text):
             recommendation_type = "HOLD"
             confidence = 0.7
             
@@ -1318,9 +1382,9 @@ def parse_perplexity_analysis(analysis, ticker):
             hold_indicators = ["hold", "neutral", "mixed", "cautious", "moderate", "balanced", "sideways", "accumulate"]
             
             # Count mentions of bullish/bearish terms
-            buy_count = sum(1 for indicator in buy_indicators if indicator in analysis_text.lower())
-            sell_count = sum(1 for indicator in sell_indicators if indicator in analysis_text.lower())
-            hold_count = sum(1 for indicator in hold_indicators if indicator in analysis_text.lower())
+            buy_count = sum(1 for indicator in buy_indicators if indicator in text)
+            sell_count = sum(1 for indicator in sell_indicators if indicator in text)
+            hold_count = sum(1 for indicator in hold_indicators if indicator in text)
             
             # Determine action based on sentiment
             if buy_count > sell_count + hold_count:
@@ -1337,26 +1401,26 @@ def parse_perplexity_analysis(analysis, ticker):
         recommendation["recommendation"]["confidence"] = confidence
             
         # Extract price targets if available
-        price_match = re.search(r"(?:current|price|trading at)[:\s]+\$?(\d+(?:\.\d+)?)", analysis_text.lower())
+        price_match = PRICE_RE.search(text)
         if price_match:
             recommendation["recommendation"]["entry_price"] = float(price_match.group(1))
             
         # Look for support levels as potential stop loss
-        sl_match = re.search(r"(?:stop[- ]loss|support)[:\s]+\$?(\d+(?:\.\d+)?)", analysis_text.lower())
+        sl_match = SUPPORT_RE.search(text)
         if sl_match:
             recommendation["recommendation"]["stop_loss"] = float(sl_match.group(1))
             
         # Look for resistance as potential take profit
-        tp_match = re.search(r"(?:take[- ]profit|target|resistance)[:\s]+\$?(\d+(?:\.\d+)?)", analysis_text.lower())
+        tp_match = RESISTANCE_RE.search(text)
         if tp_match:
             recommendation["recommendation"]["take_profit"] = float(tp_match.group(1))
             
         # Try to extract timeframe
-        if "short-term" in analysis_text.lower() or "day" in analysis_text.lower() or "hourly" in analysis_text.lower():
+        if "short-term" in text or "day" in text or "hourly" in text:
             recommendation["recommendation"]["timeframe"] = "short-term"
-        elif "medium-term" in analysis_text.lower() or "week" in analysis_text.lower() or "monthly" in analysis_text.lower():
+        elif "medium-term" in text or "week" in text or "monthly" in text:
             recommendation["recommendation"]["timeframe"] = "medium-term"
-        elif "long-term" in analysis_text.lower() or "year" in analysis_text.lower():
+        elif "long-term" in text or "year" in text:
             recommendation["recommendation"]["timeframe"] = "long-term"
             
         # Calculate risk/reward if both stop-loss and take-profit are available
@@ -1401,21 +1465,27 @@ async def execute_trade(
     """
     global client
     
-    # Set default values from environment variables if not provided
-    if position_size is None and os.getenv("DEFAULT_POSITION_SIZE_PCT"):
-        position_size = float(os.getenv("DEFAULT_POSITION_SIZE_PCT", 1))
+    # Set default values from environment variables if not provided,
+    # reading each variable only once
+    default_position_size = os.getenv("DEFAULT_POSITION_SIZE_PCT")
+    if position_size is None and default_position_size:
+        position_size = float(default_position_size)
         
-    if risk_percentage is None and os.getenv("DEFAULT_RISK_PCT"):
-        risk_percentage = float(os.getenv("DEFAULT_RISK_PCT", 1))
+    default_risk = os.getenv("DEFAULT_RISK_PCT")
+    if risk_percentage is None and default_risk:
+        risk_percentage = float(default_risk)
         
-    if stop_loss_percentage is None and os.getenv("DEFAULT_STOP_LOSS_PCT"):
-        stop_loss_percentage = float(os.getenv("DEFAULT_STOP_LOSS_PCT", 0.15))
+    default_stop_loss = os.getenv("DEFAULT_STOP_LOSS_PCT")
+    if stop_loss_percentage is None and default_stop_loss:
+        stop_loss_percentage = float(default_stop_loss)
         
-    if take_profit_percentage is None and os.getenv("DEFAULT_TAKE_PROFIT_PCT"):
-        take_profit_percentage = float(os.getenv("DEFAULT_TAKE_PROFIT_PCT", 0.3))
+    default_take_profit = os.getenv("DEFAULT_TAKE_PROFIT_PCT")
+    if take_profit_percentage is None and default_take_profit:
+        take_profit_percentage = float(default_take_profit)
         
-    if leverage is None and os.getenv("DEFAULT_LEVERAGE"):
-        leverage = int(os.getenv("DEFAULT_LEVERAGE", 12))
+    default_leverage = os.getenv("DEFAULT_LEVERAGE")
+    if leverage is None and default_leverage:
+        leverage = int(default_leverage)
     
     try:
         # Initialize Bluefin client if needed
@@ -1643,6 +1713,23 @@ async def execute_trade(
         logger.error(f"Error in execute_trade: {e}", exc_info=True)
         return None
 
+# Directory the webhook server drops alert files into
+ALERTS_DIR = Path("alerts")
+
+# Unparseable alert files modified within this many seconds are assumed to still be
+# being written and are left for a later pass instead of being discarded
+ALERT_WRITE_GRACE_SECONDS = 5
+
+# VuManChu Cipher B signal types the agent trades on
+VALID_SIGNALS = frozenset({"GREEN_CIRCLE", "RED_CIRCLE", "GOLD_CIRCLE", "PURPLE_TRIANGLE"})
+
+# Alert action -> (trade direction, order side)
+ACTION_MAP = {
+    "BUY": ("Bullish", ORDER_SIDE.BUY),
+    "SELL": ("Bearish", ORDER_SIDE.SELL)
+}
+
+
 async def process_alerts():
     """
     Process incoming alerts from the webhook server.
@@ -1658,153 +1745,240 @@ async def process_alerts():
     
     The processed alert files are deleted to avoid double-processing.
     """
-    
-    if not os.path.exists("alerts"):
-        os.makedirs("alerts", exist_ok=True)
+    # Check for new alert files (scandir entries carry their file type, avoiding a stat per file)
+    try:
+        with os.scandir(ALERTS_DIR) as entries:
+            alert_paths = [Path(entry.path) for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+    except FileNotFoundError:
+        ALERTS_DIR.mkdir(exist_ok=True)
         return
-        
-    # Check for new alert files
-    for file in os.listdir("alerts"):
-        if file.endswith(".json"):
-            alert_path = os.path.join("alerts", file)
+    
+    for alert_path in alert_paths:
+        await _process_alert_file(alert_path)
+
+
+async def _process_alert_file(alert_path):
+    """
+    Process a single alert file and delete it once handled.
+    
+    Args:
+        alert_path: Path of the JSON alert file
+    """
+    try:
+        # Read the alert data
+        with open(alert_path, "rb") as f:
+            alert = orjson.loads(f.read())
+        
+        logger.info(f"New alert received: {alert}")
+        
+        # Handle direct alert format from webhook server
+        if "symbol" in alert and "type" in alert:
+            symbol = alert.get("symbol")
+            trade_type = alert.get("type")
+            position_size = alert.get("position_size", float(os.getenv("DEFAULT_POSITION_SIZE_PCT", "0.05")))
+            leverage = alert.get("leverage", int(os.getenv("DEFAULT_LEVERAGE", "5")))
+            stop_loss = alert.get("stop_loss", float(os.getenv("DEFAULT_STOP_LOSS_PCT", "0.15")))
+            take_profit = alert.get("take_profit", float(os.getenv("DEFAULT_TAKE_PROFIT_PCT", "0.3")))
             
-            try:
-                # Read the alert data
-                with open(alert_path, "r") as f:
-                    alert = json.load(f)
-                
-                logger.info(f"New alert received: {alert}")
-                
-                # Handle direct alert format from webhook server
-                if "symbol" in alert and "type" in alert:
-                    symbol = alert.get("symbol")
-                    trade_type = alert.get("type")
-                    position_size = alert.get("position_size", float(os.getenv("DEFAULT_POSITION_SIZE_PCT", "0.05")))
-                    leverage = alert.get("leverage", int(os.getenv("DEFAULT_LEVERAGE", "5")))
-                    stop_loss = alert.get("stop_loss", float(os.getenv("DEFAULT_STOP_LOSS_PCT", "0.15")))
-                    take_profit = alert.get("take_profit", float(os.getenv("DEFAULT_TAKE_PROFIT_PCT", "0.3")))
+            # Determine the order side
+            if trade_type.lower() == "buy":
+                side = ORDER_SIDE.BUY
+            elif trade_type.lower() == "sell":
+                side = ORDER_SIDE.SELL
+            else:
+                logger.warning(f"Invalid trade type in alert: {trade_type}")
+                alert_path.unlink(missing_ok=True)
+                return
+            
+            # Execute the trade
+            if MOCK_TRADING:
+                # Mock trade only - log the intent
+                logger.info(f"MOCK TRADE: Would execute a {side} trade for {symbol} with position size {position_size}, leverage {leverage}, stop loss {stop_loss}, take profit {take_profit}")
+            else:
+                # Execute real trade on Bluefin
+                try:
+                    logger.info(f"Executing {side} trade for {symbol} with position size {position_size}, leverage {leverage}, stop loss {stop_loss}, take profit {take_profit}")
                     
-                    # Determine the order side
-                    if trade_type.lower() == "buy":
-                        side = ORDER_SIDE.BUY
-                    elif trade_type.lower() == "sell":
-                        side = ORDER_SIDE.SELL
-                    else:
-                        logger.warning(f"Invalid trade type in alert: {trade_type}")
-                        os.remove(alert_path)
-                        continue
+                    # Ensure the leverage is set correctly
+                    await ensure_leverage(symbol, leverage)
                     
                     # Execute the trade
-                    if MOCK_TRADING:
-                        # Mock trade only - log the intent
-                        logger.info(f"MOCK TRADE: Would execute a {side} trade for {symbol} with position size {position_size}, leverage {leverage}, stop loss {stop_loss}, take profit {take_profit}")
-                    else:
-                        # Execute real trade on Bluefin
-                        try:
-                            logger.info(f"Executing {side} trade for {symbol} with position size {position_size}, leverage {leverage}, stop loss {stop_loss}, take profit {take_profit}")
-                            
-                            # Ensure the leverage is set correctly
-                            await ensure_leverage(symbol, leverage)
-                            
-                            # Execute the trade
-                            await execute_trade(
-                                symbol=symbol, 
-                                side=side, 
-                                position_size=position_size,
-                                leverage=leverage,
-                                stop_loss_percentage=stop_loss,
-                                take_profit_percentage=take_profit
-                            )
-                        except Exception as e:
-                            logger.error(f"Error executing trade: {e}", exc_info=True)
-                
-                # Extract key data from the original TradingView alert format
-                elif "indicator" in alert and alert["indicator"] == "vmanchu_cipher_b":
-                    symbol = alert.get("symbol", os.getenv("DEFAULT_SYMBOL", "SUI/USD"))
-                    timeframe = alert.get("timeframe", os.getenv("DEFAULT_TIMEFRAME", "5m"))
-                    signal_type = alert.get("signal_type", "")
-                    action = alert.get("action", "")
-                    
-                    logger.info(f"Processing VuManChu Cipher B signal: {signal_type}")
-                    logger.info(f"Symbol: {symbol}, Timeframe: {timeframe}, Action: {action}")
-                    
-                    # Map TradingView symbol to Bluefin format
-                    if "/" in symbol:
-                        base_currency = symbol.split("/")[0]
-                        bluefin_symbol = f"{base_currency}-PERP"
-                    else:
-                        bluefin_symbol = f"{symbol}-PERP"
+                    await execute_trade(
+                        symbol=symbol, 
+                        side=side, 
+                        position_size=position_size,
+                        leverage=leverage,
+                        stop_loss_percentage=stop_loss,
+                        take_profit_percentage=take_profit
+                    )
+                except Exception as e:
+                    logger.error(f"Error executing trade: {e}", exc_info=True)
+        
+        # Extract key data from the original TradingView alert format
+        elif "indicator" in alert and alert["indicator"] == "vmanchu_cipher_b":
+            symbol = alert.get("symbol", os.getenv("DEFAULT_SYMBOL", "SUI/USD"))
+            timeframe = alert.get("timeframe", os.getenv("DEFAULT_TIMEFRAME", "5m"))
+            signal_type = alert.get("signal_type", "")
+            action = alert.get("action", "")
+            
+            logger.info(f"Processing VuManChu Cipher B signal: {signal_type}")
+            logger.info(f"Symbol: {symbol}, Timeframe: {timeframe}, Action: {action}")
+            
+            # Map TradingView symbol to Bluefin format
+            if "/" in symbol:
+                base_currency = symbol.split("/")[0]
+                bluefin_symbol = f"{base_currency}-PERP"
+            else:
+                bluefin_symbol = f"{symbol}-PERP"
+            
+            # Determine trade direction based on signal type and action
+            trade_direction, side = ACTION_MAP.get(action, (None, None))
+            if side is None:
+                logger.warning(f"Invalid action in alert: {action}")
+                alert_path.unlink(missing_ok=True)
+                return
+            
+            # Check if this is a valid signal type
+            if signal_type not in VALID_SIGNALS:
+                logger.warning(f"Invalid signal type: {signal_type}")
+                alert_path.unlink(missing_ok=True)
+                return
+            
+            # Execute trade based on the signal
+            if MOCK_TRADING:
+                # Mock trade only - log the intent
+                logger.info(f"MOCK TRADE: Would execute a {side} trade for {bluefin_symbol} based on {signal_type} signal")
+                logger.info(f"Trade direction: {trade_direction}")
+            else:
+                # Execute real trade on Bluefin
+                try:
+                    position_size = float(os.getenv("DEFAULT_POSITION_SIZE_PCT", "0.05"))
+                    leverage = int(os.getenv("DEFAULT_LEVERAGE", "5"))
+                    stop_loss = float(os.getenv("DEFAULT_STOP_LOSS_PCT", "0.15"))
+                    take_profit = float(os.getenv("DEFAULT_TAKE_PROFIT_PCT", "0.3"))
                     
-                    # Determine trade direction based on signal type and action
-                    if action == "BUY":
-                        trade_direction = "Bullish"
-                        side = ORDER_SIDE.BUY
-                    elif action == "SELL":
-                        trade_direction = "Bearish"
-                        side = ORDER_SIDE.SELL
-                    else:
-                        logger.warning(f"Invalid action in alert: {action}")
-                        os.remove(alert_path)
-                        continue
+                    logger.info(f"Executing {side} trade for {bluefin_symbol} with position size {position_size}, leverage {leverage}, stop loss {stop_loss}, take profit {take_profit}")
                     
-                    # Check if this is a valid signal type
-                    valid_signals = ["GREEN_CIRCLE", "RED_CIRCLE", "GOLD_CIRCLE", "PURPLE_TRIANGLE"]
-                    if signal_type not in valid_signals:
-                        logger.warning(f"Invalid signal type: {signal_type}")
-                        os.remove(alert_path)
-                        continue
+                    # Ensure the leverage is set correctly
+                    await ensure_leverage(bluefin_symbol, leverage)
                     
-                    # Execute trade based on the signal
-                    if MOCK_TRADING:
-                        # Mock trade only - log the intent
-                        logger.info(f"MOCK TRADE: Would execute a {side} trade for {bluefin_symbol} based on {signal_type} signal")
-                        logger.info(f"Trade direction: {trade_direction}")
-                    else:
-                        # Execute real trade on Bluefin
-                        try:
-                            position_size = float(os.getenv("DEFAULT_POSITION_SIZE_PCT", "0.05"))
-                            leverage = int(os.getenv("DEFAULT_LEVERAGE", "5"))
-                            stop_loss = float(os.getenv("DEFAULT_STOP_LOSS_PCT", "0.15"))
-                            take_profit = float(os.getenv("DEFAULT_TAKE_PROFIT_PCT", "0.3"))
-                            
-                            logger.info(f"Executing {side} trade for {bluefin_symbol} with position size {position_size}, leverage {leverage}, stop loss {stop_loss}, take profit {take_profit}")
-                            
-                            # Ensure the leverage is set correctly
-                            await ensure_leverage(bluefin_symbol, leverage)
-                            
-                            # Execute the trade
-                            await execute_trade(
-                                symbol=bluefin_symbol, 
-                                side=side, 
-                                position_size=position_size,
-                                leverage=leverage,
-                                stop_loss_percentage=stop_loss,
-                                take_profit_percentage=take_profit
-                            )
-                        except Exception as e:
-                            logger.error(f"Error executing trade: {e}", exc_info=True)
-                else:
-                    logger.warning(f"Unsupported alert format: {alert}")
-                
-                # Clean up the processed alert file
-                os.remove(alert_path)
-                
-            except json.JSONDecodeError:
-                logger.error(f"Error decoding JSON from file: {alert_path}")
-                os.remove(alert_path)
-            except Exception as e:
-                logger.error(f"Error processing alert file {alert_path}: {e}", exc_info=True)
+                    # Execute the trade
+                    await execute_trade(
+                        symbol=bluefin_symbol, 
+                        side=side, 
+                        position_size=position_size,
+                        leverage=leverage,
+                        stop_loss_percentage=stop_loss,
+                        take_profit_percentage=take_profit
+                    )
+                except Exception as e:
+                    logger.error(f"Error executing trade: {e}", exc_info=True)
+        else:
+            logger.warning(f"Unsupported alert format: {alert}")
+        
+        # Clean up the processed alert file
+        alert_path.unlink(missing_ok=True)
+        
+    except orjson.JSONDecodeError:
+        try:
+            still_writing = time.time() - alert_path.stat().st_mtime < ALERT_WRITE_GRACE_SECONDS
+        except FileNotFoundError:
+            return
+        if still_writing:
+            logger.debug(f"Alert file still being written, retrying later: {alert_path}")
+            return
+        logger.error(f"Error decoding JSON from file: {alert_path}")
+        alert_path.unlink(missing_ok=True)
+    except Exception as e:
+        logger.error(f"Error processing alert file {alert_path}: {e}", exc_info=True)
+
+
+# Seconds between safety rescans when watchdog is driving the alert loop
+ALERT_RESCAN_INTERVAL = 30
+
+
+class AlertFileHandler(FileSystemEventHandler):
+    """Wake the alert loop when a JSON alert file has been written to the alerts directory."""
+    
+    def __init__(self, loop, wakeup):
+        self.loop = loop
+        self.wakeup = wakeup
+    
+    def _notify(self, path):
+        if path.endswith(".json"):
+            self.loop.call_soon_threadsafe(self.wakeup.set)
     
-    # Small delay to avoid high CPU usage
-    await asyncio.sleep(1)
+    def on_created(self, event):
+        # The file may still be partly written; _process_alert_file leaves it until complete
+        self._notify(event.src_path)
+    
+    def on_modified(self, event):
+        # Only inotify emits closed events, so later writes wake the loop on other platforms
+        self._notify(event.src_path)
+    
+    def on_closed(self, event):
+        # Fired after the writer closes the file, so the JSON is complete
+        self._notify(event.src_path)
+    
+    def on_moved(self, event):
+        self._notify(event.dest_path)
+
+
+async def watch_alerts():
+    """
+    Process alerts as they arrive in the alerts directory.
+    
+    Alerts already waiting in the directory are drained first. With watchdog installed the
+    loop then sleeps until a new alert file is written (rescanning every ALERT_RESCAN_INTERVAL
+    seconds in case an event is missed); without it the directory is polled once per second.
+    """
+    ALERTS_DIR.mkdir(exist_ok=True)
+    
+    observer = None
+    wakeup = asyncio.Event()
+    if WATCHDOG_AVAILABLE:
+        observer = Observer()
+        observer.schedule(AlertFileHandler(asyncio.get_running_loop(), wakeup), str(ALERTS_DIR), recursive=False)
+        observer.start()
+        logger.info("Watching alerts directory for new alerts")
+    
+    try:
+        while True:
+            # Clear before scanning so alerts written mid-scan still wake the next pass
+            wakeup.clear()
+            try:
+                await process_alerts()
+            except Exception as e:
+                logger.error(f"Error processing alerts: {e}")
+            
+            if observer is None:
+                await asyncio.sleep(1)
+                continue
+            
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=ALERT_RESCAN_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
 
 # Define a main function for running the agent
 async def main():
-    setup_logging()
+    log_listener = setup_logging()
+    try:
+        await run_agent()
+    finally:
+        # Flush any queued log records before exiting
+        log_listener.stop()
+
+async def run_agent():
     logger.info("Starting agent...")
     
     # Create necessary directories
-    os.makedirs("alerts", exist_ok=True)
+    ALERTS_DIR.mkdir(exist_ok=True)
     os.makedirs("logs", exist_ok=True)
     
     # Initialize clients
@@ -1814,12 +1988,7 @@ async def main():
     api_task = asyncio.create_task(start_api_server())
     
     # Start alert processing loop
-    while True:
-        try:
-            await process_alerts()
-        except Exception as e:
-            logger.error(f"Error processing alerts: {e}")
-        await asyncio.sleep(1)
+    await watch_alerts()
 
 # Define FastAPI app
 app = FastAPI(title="Trading Agent API", description="API for the trading agent")
@@ -1933,11 +2102,15 @@ async def get_trades(limit: int = 10):
 
 @app.post("/open_trade")
 async def open_trade(trade: dict):
-    """Open a new trade."""
+    """Open a new trade, returning the updated positions so clients needn't re-read /positions."""
     # TODO: Validate trade parameters
     # TODO: Open actual trade
     logger.info(f"Opening trade: {trade}")
-    return {"status": "success", "trade_id": f"trade_{get_timestamp()}"}
+    return {
+        "status": "success",
+        "trade_id": f"trade_{get_timestamp()}",
+        "positions": await get_positions()
+    }
 
 @app.post("/close_trade")
 async def close_trade(trade_id: str):
@@ -1979,14 +2152,20 @@ async def calculate_position_size(symbol, side, risk_percentage=None, stop_loss_
     stop_loss_percentage = stop_loss_percentage or RISK_PARAMS.get("stop_loss_percentage", 0.05)
     
     try:
-        # Get margin bank balance
+        # Get margin bank balance and the current market price concurrently
         # Based on https://bluefin-exchange.readme.io/reference/get-deposit-withdraw-usdc-from-marginbank
         if hasattr(client, 'get_margin_bank_balance'):
-            margin_balance = await client.get_margin_bank_balance()
+            margin_balance, current_price = await asyncio.gather(
+                client.get_margin_bank_balance(),
+                get_market_price(symbol)
+            )
             logger.info(f"Margin bank balance: {margin_balance} USDC")
         else:
             # Fallback to account details
-            account_details = await client.get_account_details()
+            account_details, current_price = await asyncio.gather(
+                client.get_account_details(),
+                get_market_price(symbol)
+            )
             margin_balance = account_details.get("margin_balance", 0)
             logger.info(f"Account margin balance: {margin_balance} USDC")
         
@@ -1994,9 +2173,6 @@ async def calculate_position_size(symbol, side, risk_percentage=None, stop_loss_
         risk_amount = margin_balance * risk_percentage
         logger.info(f"Risking {risk_percentage*100}% of balance: {risk_amount} USDC")
         
-        # Get current market price for the symbol
-        current_price = await get_market_price(symbol)
-        
         # Calculate position size based on risk and stop loss
         # Formula: Position Size = Risk Amount / (Current Price * Stop Loss Percentage)
         position_size = risk_amount / (current_price * stop_loss_percentage)
@@ -93,7 +93,7 @@ class BluefinWebSocketManager:
             self.websocket = await websockets.connect(self.url)
             self.running = True
             self.reconnect_attempts = 0
-            self.last_message_time = time.time()
+            self.last_message_time = time.perf_counter()
             
             # Start message processor
             asyncio.create_task(self._process_messages())
@@ -255,7 +255,7 @@ class BluefinWebSocketManager:
             try:
                 # Receive message
                 message = await self.websocket.recv()
-                self.last_message_time = time.time()
+                self.last_message_time = time.perf_counter()
                 
                 # Parse message
                 data = json.loads(message)
@@ -306,7 +306,7 @@ class BluefinWebSocketManager:
                 await asyncio.sleep(self.heartbeat_interval)
                 
                 # Check if we've received a message recently
-                if time.time() - self.last_message_time > self.heartbeat_interval * 2:
+                if time.perf_counter() - self.last_message_time > self.heartbeat_interval * 2:
                     logger.warning("No messages received recently, reconnecting...")
                     await self.reconnect()
             except asyncio.CancelledError:
@@ -372,11 +372,11 @@ async def example():
             return
         
         # Process messages for 30 seconds
-        end_time = time.time() + 30
+        end_time = time.perf_counter() + 30
         async for message in ws_manager.messages():
             logger.info(f"Received message: {message}")
             
-            if time.time() > end_time:
+            if time.perf_counter() > end_time:
                 break
         
         # Unsubscribe from streams
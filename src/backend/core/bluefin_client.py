@@ -357,6 +357,8 @@ class MockBluefinClient(BluefinClientInterface):
         self.address = "0xmock_address"
         self.api_key = "mock_api_key"
         self.positions = []
+        # Mirrors self.positions keyed by symbol for O(1) lookups
+        self.positions_by_symbol = {}
         self.orders = {}
         self.market_prices = {
             "BTC-PERP": 40000.0,
@@ -390,7 +392,8 @@ class MockBluefinClient(BluefinClientInterface):
                          time_in_force: str = "GTC",
                          leverage: Optional[int] = None) -> Dict[str, Any]:
         """Place a mock order."""
-        order_id = f"mock_order_{int(time.time())}"
+        # Nanosecond monotonic clock keeps ids unique across orders placed in the same second
+        order_id = f"mock_order_{time.monotonic_ns()}"
         
         order = {
             "orderId": order_id,
@@ -412,7 +415,7 @@ class MockBluefinClient(BluefinClientInterface):
             order["status"] = "FILLED"
             
             # Update positions
-            position = next((p for p in self.positions if p.get("symbol") == symbol), None)
+            position = self.positions_by_symbol.get(symbol)
             
             if position:
                 # Update existing position
@@ -422,13 +425,15 @@ class MockBluefinClient(BluefinClientInterface):
                 else:
                 # Create new position
                 new_qty = quantity if side == ORDER_SIDE.BUY else -quantity
-                self.positions.append({
+                position = {
                     "symbol": symbol,
                     "positionQty": str(new_qty),
                     "entryPrice": str(price if price is not None else self.market_prices.get(symbol, 1000.0)),
                     "markPrice": str(self.market_prices.get(symbol, 1000.0)),
                     "unrealizedPnl": "0"
-                })
+                }
+                self.positions.append(position)
+                self.positions_by_symbol[symbol] = position
         
         return order
     
@@ -446,7 +451,7 @@ class MockBluefinClient(BluefinClientInterface):
                             symbol: str, 
                             quantity: Optional[float] = None) -> Dict[str, Any]:
         """Close a mock position."""
-        position = next((p for p in self.positions if p.get("symbol") == symbol), None)
+        position = self.positions_by_symbol.get(symbol)
         
         if not position:
             return {"status": "success", "message": "No position to close"}
@@ -475,6 +480,7 @@ class MockBluefinClient(BluefinClientInterface):
         if quantity is None or abs(quantity) >= abs(position_size):
             # Remove position if fully closed
             self.positions = [p for p in self.positions if p.get("symbol") != symbol]
+            self.positions_by_symbol.pop(symbol, None)
         else:
             # Update position size
             new_size = position_size + close_quantity if side == ORDER_SIDE.BUY else position_size - close_quantity
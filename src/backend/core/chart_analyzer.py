@@ -1,18 +1,142 @@
 import asyncio
+import io
 import logging
-import base64
-import requests
-import json
-from config import PERPLEXITY_CONFIG
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+import aiohttp
+import backoff
+import orjson
+import pybase64
+from aiolimiter import AsyncLimiter
+from PIL import Image
+
+from core.config import PERPLEXITY_CONFIG
 
 logger = logging.getLogger(__name__)
 
-async def analyze_chart(chart_image):
+PERPLEXITY_API_URL = "https://api.perplexity.ai/chat/completions"
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+# Patterns for parsing the analysis text; the confidence number is the first
+# one on the CONFIDENCE line, skipping an echoed "(1-10)" scale
+_YES_RE = re.compile(r"\bYES\b", re.IGNORECASE)
+_CONFIDENCE_RE = re.compile(r"CONFIDENCE(?:[^\d\n]*?(?:\(\s*\d+\s*-\s*\d+\s*\)[^\d\n]*)?(\d+))?", re.IGNORECASE)
+
+class PerplexityAPIError(Exception):
+    """Custom exception for Perplexity API errors."""
+    pass
+
+class PerplexityRetryableError(PerplexityAPIError):
+    """Perplexity API error that is expected to succeed on retry (429/5xx)."""
+    
+    def __init__(self, message, retry_after: Optional[float] = None):
+        super().__init__(message)
+        # Seconds the server asked us to wait (Retry-After header), if any
+        self.retry_after = retry_after
+
+# Static chart analysis instructions; the chart is attached separately
+_ANALYSIS_PROMPT = """
+    Analyze this TradingView chart with VumanChu Cipher A and B indicators and Heiken Ashi candles.
+    
+    Focus on:
+    1. The current trend direction based on Heiken Ashi candles
+    2. VumanChu Cipher A indicator (green and red dots)
+    3. VumanChu Cipher B indicator (histogram and lines)
+    4. Support and resistance levels
+    5. Volume patterns
+    
+    Determine if this is a valid trading signal. A valid signal should have:
+    - For BUY signals: Green Heiken Ashi candles, green dots above price in VumanChu A, and positive histogram in VumanChu B
+    - For SELL signals: Red Heiken Ashi candles, red dots below price in VumanChu A, and negative histogram in VumanChu B
+    
+    Provide your analysis and explicitly state whether you confirm this trade (YES/NO) and your confidence level (1-10).
+    """
+
+# System message sent with every Perplexity request
+_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are a professional crypto trader with expertise in technical analysis, particularly with VumanChu Cipher indicators and Heiken Ashi candles."
+}
+
+# Shared HTTP session for Perplexity calls (installed by the FastAPI startup hook)
+_http_session: Optional[aiohttp.ClientSession] = None
+
+# Bound in-flight Perplexity requests and keep under the requests/minute limit
+_perplexity_semaphore = asyncio.Semaphore(PERPLEXITY_CONFIG["max_concurrency"])
+_perplexity_limiter = AsyncLimiter(PERPLEXITY_CONFIG["requests_per_minute"], 60)
+
+def set_http_session(session: Optional[aiohttp.ClientSession]):
+    """
+    Install the shared aiohttp session used for Perplexity API calls.
+    
+    Args:
+        session: The session created at application startup, or None to detach it
+    """
+    global _http_session
+    _http_session = session
+
+@lru_cache(maxsize=1)
+def _perplexity_headers(api_key: str) -> Dict[str, str]:
+    """
+    Build the Perplexity request headers, rebuilt only when the API key changes.
+    
+    Args:
+        api_key: The Perplexity API key
+        
+    Returns:
+        dict: The request headers (shared; do not mutate)
+    """
+    return {
+        "Authorization": f"Bearer {api_key}",
+        "Content-Type": "application/json"
+    }
+
+def create_http_session() -> aiohttp.ClientSession:
+    """
+    Create an aiohttp session with a keep-alive connection pool.
+    
+    Connections (and their TLS handshakes) are reused across analyses, so
+    only one session should exist per process.
+    
+    Returns:
+        aiohttp.ClientSession: A new session
+    """
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=PERPLEXITY_CONFIG["timeout"]),
+        connector=aiohttp.TCPConnector(limit=20, limit_per_host=10, keepalive_timeout=60, ttl_dns_cache=300),
+        headers={"Connection": "keep-alive"}
+    )
+
+def get_http_session() -> aiohttp.ClientSession:
+    """
+    Get the shared aiohttp session, creating one if none was installed.
+    
+    Returns:
+        aiohttp.ClientSession: The shared session
+    """
+    global _http_session
+    if _http_session is None or _http_session.closed:
+        _http_session = create_http_session()
+    return _http_session
+
+async def close_http_session():
+    """Close the shared aiohttp session, if one is open."""
+    global _http_session
+    if _http_session is not None and not _http_session.closed:
+        await _http_session.close()
+    _http_session = None
+
+async def analyze_chart(chart_image, symbol: Optional[str] = None):
     """
     Analyze the TradingView chart screenshot using Perplexity AI.
     
     Args:
         chart_image: The screenshot image of the TradingView chart
+        symbol: Optional symbol the chart belongs to, added to the prompt
         
     Returns:
         dict: Analysis result with trade confirmation and reasoning
@@ -23,19 +147,16 @@ async def analyze_chart(chart_image):
         return {"status": "error", "message": error_msg}
     
     try:
-        # Convert image to base64 for API request
-        image_base64 = base64.b64encode(chart_image).decode('utf-8')
-        
         # Prepare the prompt for Perplexity
-        prompt = create_analysis_prompt(image_base64)
+        prompt = create_analysis_prompt(symbol)
         
-        # Call Perplexity API
-        analysis_result = await call_perplexity_api(prompt)
+        # Call Perplexity API with the chart attached as an image block
+        analysis_result = await call_perplexity_api(prompt, chart_image)
         
         # Parse the analysis result
         parsed_result = parse_analysis_result(analysis_result)
         
-        logger.info(f"Chart analysis completed: {parsed_result['trade_confirmed']}")
+        logger.info("Chart analysis completed: %s", parsed_result['trade_confirmed'])
         return parsed_result
         
     except Exception as e:
@@ -43,41 +164,150 @@ async def analyze_chart(chart_image):
         logger.exception(error_msg)
         return {"status": "error", "message": error_msg}
 
-def create_analysis_prompt(image_base64):
+@lru_cache(maxsize=64)
+def _static_prompt(symbol: Optional[str], timeframe: Optional[str], indicators: Tuple[str, ...]) -> str:
+    """
+    Build the analysis instructions for a given chart context.
+    
+    Cached so repeated alerts for the same symbol/timeframe share one string.
+    
+    Args:
+        symbol: Optional symbol the chart shows
+        timeframe: Optional chart timeframe
+        indicators: Indicators shown on the chart (a tuple, so it is hashable)
+        
+    Returns:
+        str: The prompt text
+    """
+    hints = []
+    if symbol:
+        hints.append(f"Symbol: {symbol}")
+    if timeframe:
+        hints.append(f"Timeframe: {timeframe}")
+    if indicators:
+        hints.append(f"Indicators: {', '.join(indicators)}")
+    
+    if not hints:
+        return _ANALYSIS_PROMPT
+    return _ANALYSIS_PROMPT + "\n    ".join(["Chart context:", *hints]) + "\n    "
+
+def create_analysis_prompt(symbol: Optional[str] = None, timeframe: Optional[str] = None,
+                           indicators: Optional[Sequence[str]] = None):
     """
     Create the prompt for Perplexity to analyze the chart.
     
+    The chart itself is sent as a separate image content block, so the
+    prompt only carries the text instructions.
+    
     Args:
-        image_base64: The base64-encoded image
+        symbol: Optional symbol the chart shows
+        timeframe: Optional chart timeframe
+        indicators: Optional indicators shown on the chart
         
     Returns:
         str: The prompt for Perplexity
     """
-    return f"""
-    Analyze this TradingView chart with VumanChu Cipher A and B indicators and Heiken Ashi candles.
+    return _static_prompt(symbol, timeframe, tuple(indicators or ()))
+
+async def _post_completion_once(session: aiohttp.ClientSession, headers, data):
+    """
+    Send one chat completion request to Perplexity.
     
-    Focus on:
-    1. The current trend direction based on Heiken Ashi candles
-    2. VumanChu Cipher A indicator (green and red dots)
-    3. VumanChu Cipher B indicator (histogram and lines)
-    4. Support and resistance levels
-    5. Volume patterns
+    The Retry-After header of a rate-limit or server error is attached to the
+    raised error; the retry decorator honors it before the next attempt.
     
-    Determine if this is a valid trading signal. A valid signal should have:
-    - For BUY signals: Green Heiken Ashi candles, green dots above price in VumanChu A, and positive histogram in VumanChu B
-    - For SELL signals: Red Heiken Ashi candles, red dots below price in VumanChu A, and negative histogram in VumanChu B
+    Raises:
+        PerplexityRetryableError: On 429 or 5xx responses
+        PerplexityAPIError: On any other non-200 response
+    """
+    async with _perplexity_limiter, _perplexity_semaphore:
+        async with session.post(PERPLEXITY_API_URL, headers=headers, data=orjson.dumps(data)) as response:
+            if response.status == 200:
+                return orjson.loads(await response.read())
+            
+            error_msg = f"Perplexity API returned an error: {response.status} - {await response.text()}"
+            logger.error(error_msg)
+            if response.status not in RETRYABLE_STATUS_CODES:
+                raise PerplexityAPIError(error_msg)
+            try:
+                retry_after = float(response.headers.get("Retry-After", ""))
+            except ValueError:
+                retry_after = None
     
-    Provide your analysis and explicitly state whether you confirm this trade (YES/NO) and your confidence level (1-10).
+    raise PerplexityRetryableError(error_msg, retry_after)
+
+# Longest wait between retries, whether from backoff or a Retry-After header
+MAX_RETRY_WAIT_SECONDS = 30
+
+async def _wait_for_retry_after(details):
+    """
+    Extend backoff's wait to the server's Retry-After hint, capped at MAX_RETRY_WAIT_SECONDS.
+    
+    Called by backoff only when another attempt follows, and outside the
+    concurrency slot so other requests are not held up.
+    """
+    retry_after = getattr(details["exception"], "retry_after", None)
+    if retry_after:
+        extra_wait = min(retry_after, MAX_RETRY_WAIT_SECONDS) - details["wait"]
+        if extra_wait > 0:
+            await asyncio.sleep(extra_wait)
+
+# Add retry decorator for transient Perplexity failures
+_post_completion = backoff.on_exception(backoff.expo,
+                                        (aiohttp.ClientError, asyncio.TimeoutError, PerplexityRetryableError),
+                                        max_tries=5,
+                                        max_value=MAX_RETRY_WAIT_SECONDS,
+                                        on_backoff=_wait_for_retry_after)(_post_completion_once)
+
+def compress_chart_image(chart_image: bytes, quality: int) -> bytes:
+    """
+    Re-encode a PNG chart screenshot as JPEG to shrink the upload.
     
-    [Chart Image: data:image/png;base64,{image_base64}]
+    Args:
+        chart_image: The PNG screenshot bytes
+        quality: JPEG quality (1-95)
+        
+    Returns:
+        bytes: The JPEG-encoded image
     """
+    with Image.open(io.BytesIO(chart_image)) as image:
+        buffer = io.BytesIO()
+        image.convert("RGB").save(buffer, format="JPEG", quality=quality)
+    return buffer.getvalue()
 
-async def call_perplexity_api(prompt):
+def create_image_content_block(chart_image: bytes):
+    """
+    Build a vision content block carrying the chart image.
+    
+    This is CPU-bound for multi-MB screenshots, so callers on the event loop
+    should run it in an executor.
+    
+    Args:
+        chart_image: The PNG screenshot bytes
+        
+    Returns:
+        dict: An image_url content block with the chart as a data URI
+    """
+    mime_type = "image/png"
+    if PERPLEXITY_CONFIG["jpeg_quality"]:
+        chart_image = compress_chart_image(chart_image, PERPLEXITY_CONFIG["jpeg_quality"])
+        mime_type = "image/jpeg"
+    
+    image_base64 = pybase64.b64encode_as_string(chart_image)
+    return {"type": "image_url", "image_url": {"url": f"data:{mime_type};base64,{image_base64}"}}
+
+async def call_perplexity_api(prompt, chart_image: Optional[bytes] = None,
+                              session: Optional[aiohttp.ClientSession] = None):
     """
     Call the Perplexity API to analyze the chart.
     
+    Transient failures are retried with exponential backoff; if the primary
+    model still fails, the request is retried once with the fallback model.
+    
     Args:
         prompt: The prompt for Perplexity
+        chart_image: Optional chart screenshot sent alongside the prompt
+        session: Optional aiohttp session; defaults to the shared session
         
     Returns:
         str: The analysis result from Perplexity
@@ -85,38 +315,37 @@ async def call_perplexity_api(prompt):
     Raises:
         PerplexityAPIError: If there is an error calling the API or parsing the response
     """
-    headers = {
-        "Authorization": f"Bearer {PERPLEXITY_CONFIG['api_key']}",
-        "Content-Type": "application/json"
-    }
+    headers = _perplexity_headers(PERPLEXITY_CONFIG['api_key'])
     
-    data = {
-        "model": PERPLEXITY_CONFIG["model"],
-        "messages": [
-            {
-                "role": "system",
-                "content": "You are a professional crypto trader with expertise in technical analysis, particularly with VumanChu Cipher indicators and Heiken Ashi candles."
-            },
-            {
-                "role": "user",
-                "content": prompt
-            }
-        ]
-    }
+    # Attach the chart as a vision content block rather than inlining it in the prompt
+    # (encoding runs in the default executor to keep the event loop responsive)
+    user_content = prompt
+    if chart_image:
+        image_block = await asyncio.get_running_loop().run_in_executor(None, create_image_content_block, chart_image)
+        user_content = [{"type": "text", "text": prompt}, image_block]
+    
+    messages = [
+        _SYSTEM_MESSAGE,
+        {
+            "role": "user",
+            "content": user_content
+        }
+    ]
+    
+    session = session or get_http_session()
     
     try:
-        response = requests.post(
-            "https://api.perplexity.ai/chat/completions",
-            headers=headers,
-            json=data
-        )
-        
-        if response.status_code != 200:
-            error_msg = f"Perplexity API returned an error: {response.status_code} - {response.text}"
-            logger.error(error_msg)
-            raise PerplexityAPIError(error_msg)
+        try:
+            result = await _post_completion(
+                session, headers, {"model": PERPLEXITY_CONFIG["primary_model"], "messages": messages}
+            )
+        except (aiohttp.ClientError, asyncio.TimeoutError, PerplexityRetryableError) as e:
+            logger.warning("Primary model %s failed (%s), retrying with fallback model %s",
+                           PERPLEXITY_CONFIG['primary_model'], e, PERPLEXITY_CONFIG['fallback_model'])
+            result = await _post_completion_once(
+                session, headers, {"model": PERPLEXITY_CONFIG["fallback_model"], "messages": messages}
+            )
         
-        result = response.json()
         content = result["choices"][0]["message"]["content"]
         return content
     
@@ -138,30 +367,22 @@ def parse_analysis_result(analysis_text):
     if not analysis_text:
         return {"trade_confirmed": False, "reason": "No analysis result from Perplexity"}
     
-    # Default values
-    trade_confirmed = False
-    confidence = 0
     reason = analysis_text
     
-    # Look for explicit confirmation
-    if "YES" in analysis_text.upper() and "CONFIDENCE" in analysis_text.upper():
-        trade_confirmed = True
-        
-        # Try to extract confidence level
-        try:
-            confidence_text = analysis_text.upper().split("CONFIDENCE")[1].split("\n")[0]
-            confidence_numbers = [int(s) for s in confidence_text.split() if s.isdigit()]
-            if confidence_numbers:
-                confidence = confidence_numbers[0]
-        except:
-            confidence = 7  # Default if parsing fails
+    # Without an explicit YES there is nothing to confirm, so skip the confidence scan
+    if len(analysis_text) < 3 or _YES_RE.search(analysis_text) is None:
+        return {"trade_confirmed": False, "confidence": 0, "reason": reason}
+    
+    # Look for the confidence level that accompanies the confirmation
+    confidence_match = _CONFIDENCE_RE.search(analysis_text)
+    trade_confirmed = confidence_match is not None
+    
+    confidence = 0
+    if trade_confirmed and confidence_match.group(1):
+        confidence = int(confidence_match.group(1))
     
     return {
         "trade_confirmed": trade_confirmed,
         "confidence": confidence,
         "reason": reason
     }
-
-class PerplexityAPIError(Exception):
-    """Custom exception for Perplexity API errors."""
-    pass 
\ No newline at end of file
@@ -5,12 +5,73 @@ This file contains all configurable parameters for the trading agent.
 """
 
 import os
+import json
 from typing import Dict, Any
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+# Required keys for each validated configuration section
+_REQUIRED_KEYS = {
+    "TRADING_PARAMS": [
+        "chart_symbol",
+        "timeframe",
+        "candle_type",
+        "indicators",
+        "min_confidence",
+        "analysis_interval_seconds",
+        "max_position_size_usd",
+        "leverage",
+        "trading_symbol",
+        "stop_loss_percentage",
+        "take_profit_multiplier"
+    ],
+    "RISK_PARAMS": [
+        "max_risk_per_trade",
+        "max_open_positions",
+        "max_daily_loss",
+        "min_risk_reward_ratio"
+    ],
+    "AI_PARAMS": [
+        "use_perplexity",
+        "use_claude",
+        "perplexity_confidence_threshold",
+        "claude_confidence_threshold",
+        "confidence_concordance_required"
+    ]
+}
+
+# Value checks for each section as (key, predicate, requirement) tuples
+_VALIDATORS = {
+    "TRADING_PARAMS": [
+        ("min_confidence", lambda v: 0 <= v <= 1, "between 0 and 1"),
+        ("leverage", lambda v: v >= 1, "greater than or equal to 1"),
+        ("stop_loss_percentage", lambda v: 0 <= v <= 1, "between 0 and 1"),
+    ],
+    "RISK_PARAMS": [
+        ("max_risk_per_trade", lambda v: 0 <= v <= 1, "between 0 and 1"),
+        ("max_open_positions", lambda v: v >= 1, "greater than or equal to 1"),
+        ("max_daily_loss", lambda v: 0 <= v <= 1, "between 0 and 1"),
+        ("min_risk_reward_ratio", lambda v: v >= 1, "greater than or equal to 1"),
+    ],
+    "AI_PARAMS": [
+        ("perplexity_confidence_threshold", lambda v: 0 <= v <= 1, "between 0 and 1"),
+        ("claude_confidence_threshold", lambda v: 0 <= v <= 1, "between 0 and 1"),
+    ],
+}
+
+# Fingerprints of configurations that have already passed validation
+_validated_configs: set = set()
+
+def _freeze(value: Any):
+    """Convert a configuration value into a hashable equivalent."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple, set)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
 def validate_config(config: Dict[str, Any], section: str):
     """
     Validate a configuration dictionary.
@@ -20,71 +81,45 @@ def validate_config(config: Dict[str, Any], section: str):
         section: The name of the configuration section (for error messages)
         
     Raises:
-        ValueError: If any required keys are missing or have invalid values
+        ValueError: If any required keys are missing or have invalid values;
+            the message lists every problem found
     """
-    required_keys = {
-        "TRADING_PARAMS": [
-            "chart_symbol",
-            "timeframe",
-            "candle_type",
-            "indicators",
-            "min_confidence",
-            "analysis_interval_seconds",
-            "max_position_size_usd",
-            "leverage",
-            "trading_symbol",
-            "stop_loss_percentage",
-            "take_profit_multiplier"
-        ],
-        "RISK_PARAMS": [
-            "max_risk_per_trade",
-            "max_open_positions",
-            "max_daily_loss",
-            "min_risk_reward_ratio"
-        ],
-        "AI_PARAMS": [
-            "use_perplexity",
-            "use_claude",
-            "perplexity_confidence_threshold",
-            "claude_confidence_threshold",
-            "confidence_concordance_required"
-        ]
-    }
+    # Skip configurations that have already been validated
+    try:
+        fingerprint = (section, _freeze(config))
+        hash(fingerprint)
+    except TypeError:
+        fingerprint = None
+    if fingerprint is not None and fingerprint in _validated_configs:
+        return
     
-    for key in required_keys[section]:
+    # Collect every problem so they can all be fixed in one pass
+    errors = []
+    for key in _REQUIRED_KEYS[section]:
         if key not in config:
-            raise ValueError(f"Missing required key '{key}' in {section} configuration")
+            errors.append(f"Missing required key '{key}' in {section} configuration")
             
     # Additional validation for specific keys
-    if section == "TRADING_PARAMS":
-        if config["min_confidence"] < 0 or config["min_confidence"] > 1:
-            raise ValueError(f"min_confidence must be between 0 and 1 (got {config['min_confidence']})")
-        
-        if config["leverage"] < 1:
-            raise ValueError(f"leverage must be greater than or equal to 1 (got {config['leverage']})")
-            
-        if config["stop_loss_percentage"] < 0 or config["stop_loss_percentage"] > 1:
-            raise ValueError(f"stop_loss_percentage must be between 0 and 1 (got {config['stop_loss_percentage']})")
-            
-    elif section == "RISK_PARAMS":
-        if config["max_risk_per_trade"] < 0 or config["max_risk_per_trade"] > 1:
-            raise ValueError(f"max_risk_per_trade must be between 0 and 1 (got {config['max_risk_per_trade']})")
-            
-        if config["max_open_positions"] < 1:
-            raise ValueError(f"max_open_positions must be greater than or equal to 1 (got {config['max_open_positions']})")
-            
-        if config["max_daily_loss"] < 0 or config["max_daily_loss"] > 1:
-            raise ValueError(f"max_daily_loss must be between 0 and 1 (got {config['max_daily_loss']})")
-            
-        if config["min_risk_reward_ratio"] < 1:
-            raise ValueError(f"min_risk_reward_ratio must be greater than or equal to 1 (got {config['min_risk_reward_ratio']})")
-            
-    elif section == "AI_PARAMS":
-        if config["perplexity_confidence_threshold"] < 0 or config["perplexity_confidence_threshold"] > 1:
-            raise ValueError(f"perplexity_confidence_threshold must be between 0 and 1 (got {config['perplexity_confidence_threshold']})")
-            
-        if config["claude_confidence_threshold"] < 0 or config["claude_confidence_threshold"] > 1:
-            raise ValueError(f"claude_confidence_threshold must be between 0 and 1 (got {config['claude_confidence_threshold']})")
+    for key, is_valid, requirement in _VALIDATORS.get(section, ()):
+        if key not in config:
+            continue
+        value = config[key]
+        if not is_valid(value):
+            errors.append(f"{key} must be {requirement} (got {value})")
+    
+    if errors:
+        raise ValueError(f"Invalid {section} configuration:\n  " + "\n  ".join(errors))
+    
+    # Remember this configuration so identical re-validations are skipped
+    if fingerprint is not None:
+        _validated_configs.add(fingerprint)
+
+# Values accepted as true for boolean environment variables
+_TRUE_VALUES = frozenset({"true", "1", "t", "yes"})
+
+def _env_bool(name: str, default: str) -> bool:
+    """Read a boolean flag from the environment."""
+    return os.getenv(name, default).lower() in _TRUE_VALUES
 
 # Environment variables with defaults
 # Server configuration
@@ -92,7 +127,7 @@ PORT = int(os.getenv("PORT", "5000"))
 SOCKET_PORT = int(os.getenv("SOCKET_PORT", "5008"))
 WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "5004"))
 WEBHOOK_HOST = os.getenv("WEBHOOK_HOST", "0.0.0.0")
-FLASK_DEBUG = os.getenv("FLASK_DEBUG", "False").lower() in ("true", "1", "t", "yes")
+FLASK_DEBUG = _env_bool("FLASK_DEBUG", "False")
 FLASK_ENV = os.getenv("FLASK_ENV", "production")
 AGENT_API_URL = os.getenv("AGENT_API_URL", f"http://localhost:{SOCKET_PORT}/api/process_alert")
 
@@ -102,7 +137,7 @@ ADMIN_USERNAME = os.getenv("ADMIN_USERNAME", "admin")
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "admin")
 
 # Trading settings
-MOCK_TRADING = os.getenv("MOCK_TRADING", "True").lower() in ("true", "1", "t", "yes")
+MOCK_TRADING = _env_bool("MOCK_TRADING", "True")
 DEFAULT_SYMBOL = os.getenv("DEFAULT_SYMBOL", "SUI/USD")
 DEFAULT_TIMEFRAME = os.getenv("DEFAULT_TIMEFRAME", "5m")
 DEFAULT_LEVERAGE = int(os.getenv("DEFAULT_LEVERAGE", "5"))
@@ -112,13 +147,13 @@ DEFAULT_TAKE_PROFIT_PCT = float(os.getenv("DEFAULT_TAKE_PROFIT_PCT", "0.3"))
 DEFAULT_MAX_POSITIONS = int(os.getenv("DEFAULT_MAX_POSITIONS", "3"))
 
 # Tunnel configuration
-USE_LOCALTUNNEL = os.getenv("USE_LOCALTUNNEL", "False").lower() in ("true", "1", "t", "yes")
+USE_LOCALTUNNEL = _env_bool("USE_LOCALTUNNEL", "False")
 LOCALTUNNEL_SUBDOMAIN = os.getenv("LOCALTUNNEL_SUBDOMAIN", "")
 LOCALTUNNEL_URL = os.getenv("LOCALTUNNEL_URL", "")
 LOCALTUNNEL_HTTPS_URL = os.getenv("LOCALTUNNEL_HTTPS_URL", "")
 
 # Bore-specific configuration
-USE_BORE = os.getenv("USE_BORE", "False").lower() in ("true", "1", "t", "yes")
+USE_BORE = _env_bool("USE_BORE", "False")
 BORE_SERVER = os.getenv("BORE_SERVER", "bore.digital")
 BORE_PORT = int(os.getenv("BORE_PORT", "2200"))
 BORE_LOCAL_HOST = os.getenv("BORE_LOCAL_HOST", "localhost")
@@ -127,7 +162,7 @@ BORE_TUNNEL_ID = os.getenv("BORE_TUNNEL_ID", "")
 BORE_PASSWORD = os.getenv("BORE_PASSWORD", "")
 
 # Logging configuration
-DEBUG_LOGS = os.getenv("DEBUG_LOGS", "False").lower() in ("true", "1", "t", "yes")
+DEBUG_LOGS = _env_bool("DEBUG_LOGS", "False")
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
 # Trading parameters
@@ -140,7 +175,7 @@ TRADING_PARAMS = {
     
     # Trading execution parameters
     "trading_symbol": os.getenv("DEFAULT_SYMBOL", "BTC-PERP"),  # Symbol to trade on Bluefin
-    "leverage": int(os.getenv("DEFAULT_LEVERAGE", "5")),        # Leverage to use for trades
+    "leverage": DEFAULT_LEVERAGE,        # Leverage to use for trades
     "min_confidence": 0.7,         # Minimum confidence score to execute a trade (0.0-1.0)
     "max_position_size_usd": 1000, # Maximum position size in USD
     "stop_loss_percentage": float(os.getenv("DEFAULT_STOP_LOSS_PCT", "0.02")),  # Default stop loss percentage if not provided by AI
@@ -154,7 +189,7 @@ TRADING_PARAMS = {
 # Risk management parameters
 RISK_PARAMS = {
     "max_risk_per_trade": 0.02,     # Maximum risk per trade (2% of account)
-    "max_open_positions": int(os.getenv("DEFAULT_MAX_POSITIONS", "3")),  # Maximum number of open positions
+    "max_open_positions": DEFAULT_MAX_POSITIONS,  # Maximum number of open positions
     "max_daily_loss": 0.05,         # Maximum daily loss (5% of account)
     "min_risk_reward_ratio": 2.0,   # Minimum risk:reward ratio
 }
@@ -213,6 +248,9 @@ PERPLEXITY_CONFIG = {
     "primary_model": os.getenv("PERPLEXITY_PRIMARY_MODEL", "sonar-pro"),
     "fallback_model": os.getenv("PERPLEXITY_FALLBACK_MODEL", "sonar"),
     "timeout": 120,
+    "max_concurrency": int(os.getenv("PERPLEXITY_MAX_CONCURRENCY", 5)),
+    "requests_per_minute": int(os.getenv("PERPLEXITY_REQUESTS_PER_MINUTE", 50)),
+    "jpeg_quality": int(os.getenv("PERPLEXITY_JPEG_QUALITY", 85)),  # 0 sends charts as PNG
 }
 
 # TradingView webhook configuration
@@ -257,7 +295,7 @@ LOGGING_CONFIG = {
 
 # Bluefin API default settings
 BLUEFIN_DEFAULTS = {
-    "network": os.getenv("BLUEFIN_NETWORK", "SUI_PROD"),
+    "network": BLUEFIN_CONFIG["network"],
     "leverage": DEFAULT_LEVERAGE,
     "default_symbol": DEFAULT_SYMBOL,
 }
@@ -265,4 +303,44 @@ BLUEFIN_DEFAULTS = {
 # Validate configurations
 validate_config(TRADING_PARAMS, "TRADING_PARAMS")
 validate_config(RISK_PARAMS, "RISK_PARAMS")
-validate_config(AI_PARAMS, "AI_PARAMS") 
\ No newline at end of file
+validate_config(AI_PARAMS, "AI_PARAMS") 
+
+def load_and_merge_config(path: str = os.path.join("config", "config.json")):
+    """
+    Merge saved parameters from a JSON config file and validate the result.
+    
+    The module-level parameter dicts are updated in place, so modules that
+    imported them see the merged values.
+    
+    Args:
+        path: Path to the saved configuration file (skipped if it does not exist)
+        
+    Returns:
+        tuple: The merged (TRADING_PARAMS, RISK_PARAMS, AI_PARAMS)
+        
+    Raises:
+        ValueError: If the merged configuration is invalid
+    """
+    sections = {
+        "TRADING_PARAMS": TRADING_PARAMS,
+        "RISK_PARAMS": RISK_PARAMS,
+        "AI_PARAMS": AI_PARAMS,
+    }
+    
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            saved_config = json.load(f)
+        for section, params in sections.items():
+            params.update(saved_config.get(section, {}))
+    
+    # Report problems from every section together rather than one at a time
+    errors = []
+    for section, params in sections.items():
+        try:
+            validate_config(params, section)
+        except ValueError as e:
+            errors.append(str(e))
+    if errors:
+        raise ValueError("\n".join(errors))
+    
+    return TRADING_PARAMS, RISK_PARAMS, AI_PARAMS
@@ -26,9 +26,16 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 # VuManChu Cipher B signal types
-BULLISH_SIGNALS = ["GREEN_CIRCLE", "GOLD_CIRCLE", "BULL_FLAG", "BULL_DIAMOND"]
-BEARISH_SIGNALS = ["RED_CIRCLE", "BEAR_FLAG", "BEAR_DIAMOND"]
-AMBIGUOUS_SIGNALS = ["PURPLE_TRIANGLE", "LITTLE_CIRCLE"]
+BULLISH_SIGNALS = frozenset({"GREEN_CIRCLE", "GOLD_CIRCLE", "BULL_FLAG", "BULL_DIAMOND"})
+BEARISH_SIGNALS = frozenset({"RED_CIRCLE", "BEAR_FLAG", "BEAR_DIAMOND"})
+AMBIGUOUS_SIGNALS = frozenset({"PURPLE_TRIANGLE", "LITTLE_CIRCLE"})
+
+# Trade direction for each unambiguous signal, and for the action of ambiguous ones
+_DIRECTION_MAP = {
+    **{signal: "buy" for signal in BULLISH_SIGNALS},
+    **{signal: "sell" for signal in BEARISH_SIGNALS},
+}
+_ACTION_DIRECTION_MAP = {"BUY": "buy", "SELL": "sell"}
 
 def get_trade_direction(signal_type: str, action: Optional[str] = None) -> str:
     """
@@ -41,20 +48,13 @@ def get_trade_direction(signal_type: str, action: Optional[str] = None) -> str:
     Returns:
         str: "buy" for long trades, "sell" for short trades
     """
-    if signal_type in BULLISH_SIGNALS:
-        return "buy"
-    elif signal_type in BEARISH_SIGNALS:
-        return "sell"
-    else:
-        # For ambiguous signals like PURPLE_TRIANGLE or LITTLE_CIRCLE
-        # use the specified action to determine direction
-        if action and action.upper() == "BUY":
-            return "buy"
-        elif action and action.upper() == "SELL":
-            return "sell"
-        else:
-            # Default to buy if can't determine
-            return "buy"
+    direction = _DIRECTION_MAP.get(signal_type)
+    if direction:
+        return direction
+    
+    # For ambiguous signals like PURPLE_TRIANGLE or LITTLE_CIRCLE
+    # use the specified action to determine direction, defaulting to buy
+    return _ACTION_DIRECTION_MAP.get((action or "").upper(), "buy")
 
 def map_tradingview_to_bluefin_symbol(tv_symbol: str) -> str:
     """
@@ -2,7 +2,6 @@ import asyncio
 import logging
 import logging.config
 import os
-import json
 from dotenv import load_dotenv
 from fastapi import FastAPI
 from bluefin_client_sui import BluefinClient, Networks
@@ -10,14 +9,13 @@ from core.config import (
     BLUEFIN_CONFIG, 
     LOGGING_CONFIG, 
     TRADINGVIEW_WEBHOOK_CONFIG, 
-    TRADING_PARAMS,
     PERFORMANCE_TRACKING_CONFIG,
     RISK_MANAGEMENT_CONFIG,
     RISK_PARAMS,
-    AI_PARAMS,
-    validate_config
+    load_and_merge_config
 )
-from api.webhook_handler import router as webhook_router
+from api.webhook_handler import router as webhook_router, close_browser
+from core import chart_analyzer
 from core.performance_tracker import performance_tracker
 from core.risk_manager import risk_manager
 from core.visualization import visualizer
@@ -30,6 +28,10 @@ app = FastAPI()
 
 @app.on_event("startup")
 async def startup_event():
+    # Load and validate saved configuration before the slow client onboarding
+    logger.info("Loading configuration...")
+    load_and_merge_config(os.path.join("config", "config.json"))
+    
     logger.info("Initializing Bluefin client...")
     global bluefin_client
     
@@ -46,7 +48,7 @@ async def startup_event():
     
     # Get public address
     address = bluefin_client.get_public_address()
-    logger.info(f'Connected to Bluefin with account address: {address}')
+    logger.info('Connected to Bluefin with account address: %s', address)
     
     # Get account data
     logger.info("Getting user account data...")
@@ -54,17 +56,22 @@ async def startup_event():
     
     if account_data:
         wallet_balance = account_data.get("walletBalance", "0")
-        logger.info(f"Wallet balance: {int(wallet_balance) / 10**18:.6f} USDC")
+        logger.info("Wallet balance: %.6f USDC", int(wallet_balance) / 10**18)
     
     logger.info("Bluefin client initialized successfully.")
     
+    # Create the shared HTTP session used for Perplexity chart analysis
+    logger.info("Creating shared HTTP session...")
+    app.state.http_session = chart_analyzer.create_http_session()
+    chart_analyzer.set_http_session(app.state.http_session)
+    
     # Initialize risk manager with trading parameters
     logger.info("Initializing risk manager...")
-    risk_manager.update_account_balance(TRADING_PARAMS["initial_account_balance"])
-    risk_manager.max_risk_per_trade = TRADING_PARAMS["max_risk_per_trade"]
-    risk_manager.max_open_trades = TRADING_PARAMS["max_concurrent_positions"]
-    risk_manager.max_risk_per_symbol = TRADING_PARAMS["max_risk_per_symbol"]
-    risk_manager.max_daily_drawdown = TRADING_PARAMS["max_daily_drawdown"]
+    if account_data:
+        risk_manager.update_account_balance(int(account_data.get("walletBalance", "0")) / 10**18)
+    risk_manager.max_risk_per_trade = RISK_PARAMS["max_risk_per_trade"]
+    risk_manager.max_open_trades = RISK_PARAMS["max_open_positions"]
+    risk_manager.max_daily_drawdown = RISK_PARAMS["max_daily_loss"]
     logger.info("Risk manager initialized.")
     
     # Initialize performance tracker
@@ -82,20 +89,6 @@ async def startup_event():
     visualizer = visualizer
     logger.info("Visualizer initialized.")
 
-    # Load saved configuration if available
-    config_dir = "config"
-    config_file = os.path.join(config_dir, "config.json")
-    if os.path.exists(config_file):
-        with open(config_file, "r") as f:
-            saved_config = json.load(f)
-            TRADING_PARAMS.update(saved_config.get("TRADING_PARAMS", {}))
-            RISK_PARAMS.update(saved_config.get("RISK_PARAMS", {}))
-            AI_PARAMS.update(saved_config.get("AI_PARAMS", {}))
-
-    # Validate loaded configuration 
-    validate_config(TRADING_PARAMS, "TRADING_PARAMS")  
-    validate_config(RISK_PARAMS, "RISK_PARAMS")
-    validate_config(AI_PARAMS, "AI_PARAMS")
 
 @app.on_event("shutdown")
 async def shutdown_event():
@@ -103,21 +96,38 @@ async def shutdown_event():
     await bluefin_client.apis.close_session()
     logger.info("Bluefin client closed.")
     
+    # Close the shared HTTP session
+    await chart_analyzer.close_http_session()
+    logger.info("HTTP session closed.")
+    
+    # Close the shared screenshot browser
+    await close_browser()
+    logger.info("Screenshot browser closed.")
+    
     # Generate final performance report
     logger.info("Generating final performance report...")
     report_files = visualizer.generate_performance_report()
-    logger.info(f"Performance report generated: {report_files}")
+    logger.info("Performance report generated: %s", report_files)
     
     # Log performance metrics
     metrics = performance_tracker.get_performance_metrics()
-    logger.info("Final performance metrics:")
-    logger.info(f"Total Trades: {metrics['total_trades']}")
-    logger.info(f"Win Rate: {metrics['win_rate']:.2%}")
-    logger.info(f"Average Profit: {metrics['average_profit']:.2f}")
-    logger.info(f"Average Loss: {metrics['average_loss']:.2f}")
-    logger.info(f"Profit Factor: {metrics['profit_factor']:.2f}")
-    logger.info(f"Total P&L: {metrics['total_pnl']:.2f}")
-    logger.info(f"Maximum Drawdown: {metrics['max_drawdown']:.2f}")
+    logger.info(
+        "Final performance metrics:\n"
+        "Total Trades: %s\n"
+        "Win Rate: %.2f%%\n"
+        "Average Profit: %.2f\n"
+        "Average Loss: %.2f\n"
+        "Profit Factor: %.2f\n"
+        "Total P&L: %.2f\n"
+        "Maximum Drawdown: %.2f",
+        metrics['total_trades'],
+        metrics['win_rate'] * 100,
+        metrics['average_profit'],
+        metrics['average_loss'],
+        metrics['profit_factor'],
+        metrics['total_pnl'],
+        metrics['max_drawdown']
+    )
 
 app.include_router(webhook_router)
 
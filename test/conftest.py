@@ -0,0 +1,14 @@
+"""
+Shared pytest configuration for the test suite.
+"""
+
+import pytest
+from pytest_asyncio import is_async_test
+
+
+def pytest_collection_modifyitems(items):
+    """Run every async test on one session-scoped event loop instead of a loop per test."""
+    session_scope_marker = pytest.mark.asyncio(scope="session")
+    for item in items:
+        if is_async_test(item):
+            item.add_marker(session_scope_marker, append=False)
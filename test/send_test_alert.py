@@ -19,7 +19,6 @@ Arguments:
 """
 
 import argparse
-import json
 import logging
 import requests
 import sys
@@ -62,8 +61,8 @@ def create_test_alert(symbol, signal_type, timeframe, action):
 def send_alert(url, alert_data):
     """Send the alert to the webhook server."""
     try:
-        logger.info(f"Sending alert to {url}")
-        logger.info(f"Alert data: {json.dumps(alert_data)}")
+        logger.info("Sending alert to %s", url)
+        logger.info("Alert data: %s", alert_data)
         
         response = requests.post(
             url,
@@ -72,17 +71,17 @@ def send_alert(url, alert_data):
             timeout=5
         )
         
-        logger.info(f"Response status code: {response.status_code}")
+        logger.info("Response status code: %s", response.status_code)
         
         if response.status_code == 200:
             logger.info("Alert sent successfully")
-            logger.info(f"Response: {json.dumps(response.json())}")
+            logger.info("Response: %s", response.json())
         else:
-            logger.error(f"Failed to send alert: {response.text}")
+            logger.error("Failed to send alert: %s", response.text)
             
         return response
     except requests.exceptions.RequestException as e:
-        logger.error(f"Failed to connect to webhook server: {str(e)}")
+        logger.error("Failed to connect to webhook server: %s", e)
         return None
 
 def main():
@@ -10,13 +10,19 @@ import os
 import sys
 import asyncio
 import logging
+import logging.handlers
+import queue
 from dotenv import load_dotenv
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Setup logging - records are queued and written by a background listener thread
+# so log calls between awaits don't block the event loop on stderr
+log_handler = logging.StreamHandler()
+log_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+log_queue = queue.Queue(-1)
+log_listener = logging.handlers.QueueListener(log_queue, log_handler)
+log_listener.start()
+logging.getLogger().addHandler(logging.handlers.QueueHandler(log_queue))
+logging.getLogger().setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Import the BluefinMarket utility
@@ -35,39 +41,35 @@ try:
     )
     logger.info("Successfully imported BluefinMarket utility")
 except ImportError as e:
-    logger.error(f"Error importing BluefinMarket utility: {e}")
+    logger.error("Error importing BluefinMarket utility: %s", e)
     logger.error("Please ensure you have created the core/bluefin_market.py file")
     sys.exit(1)
 except Exception as e:
-    logger.error(f"Unexpected error importing BluefinMarket utility: {e}")
+    logger.error("Unexpected error importing BluefinMarket utility: %s", e)
     sys.exit(1)
 
 async def test_individual_prices():
     """Test getting prices for individual trading pairs"""
     logger.info("Testing individual price fetching...")
     
-    # Get SUI price
-    sui_price = await get_sui_price()
-    logger.info(f"SUI-PERP price: {sui_price}")
-    
-    # Get BTC price
-    btc_price = await get_btc_price()
-    logger.info(f"BTC-PERP price: {btc_price}")
-    
-    # Get ETH price
-    eth_price = await get_eth_price()
-    logger.info(f"ETH-PERP price: {eth_price}")
+    # Fetch all four prices concurrently; a failing endpoint doesn't abort the others
+    results = await asyncio.gather(
+        get_sui_price(),
+        get_btc_price(),
+        get_eth_price(),
+        get_sol_price(),
+        return_exceptions=True
+    )
     
-    # Get SOL price
-    sol_price = await get_sol_price()
-    logger.info(f"SOL-PERP price: {sol_price}")
+    prices = {}
+    for symbol, result in zip(["SUI-PERP", "BTC-PERP", "ETH-PERP", "SOL-PERP"], results):
+        if isinstance(result, Exception):
+            logger.error("Error fetching %s price: %s", symbol, result)
+            result = None
+        logger.info("%s price: %s", symbol, result)
+        prices[symbol] = result
     
-    return {
-        "SUI-PERP": sui_price,
-        "BTC-PERP": btc_price,
-        "ETH-PERP": eth_price,
-        "SOL-PERP": sol_price
-    }
+    return prices
 
 async def test_batch_prices():
     """Test getting prices for main trading pairs in batch"""
@@ -76,12 +78,12 @@ async def test_batch_prices():
     # Get prices for main trading pairs
     prices = await get_main_prices()
     for symbol, price in prices.items():
-        logger.info(f"{symbol} price: {price}")
+        logger.info("%s price: %s", symbol, price)
     
     return prices
 
 async def main():
-    """Main test function"""
+    """Main test function, returning 0 if every price fetch succeeded and 1 otherwise"""
     logger.info("Starting Bluefin Market Utility Test...")
     
     try:
@@ -96,27 +98,30 @@ async def main():
         print("Symbol        | Individual    | Batch         | Match")
         print("-" * 58)
         
+        # Row and price formats are built once, outside the loop
+        row = "{0:<13} | {1:<13} | {2:<13} | {3}".format
+        fmt = "{:.4f}".format
+        
+        # Print each row and verify the results in the same pass
+        all_successful = True
         for symbol in MAIN_TRADING_PAIRS:
             ind_price = individual_prices.get(symbol)
             bat_price = batch_prices.get(symbol)
-            ind_str = f"{ind_price:.4f}" if ind_price is not None else "N/A"
-            bat_str = f"{bat_price:.4f}" if bat_price is not None else "N/A"
+            if ind_price is None or bat_price is None:
+                all_successful = False
+            ind_str = fmt(ind_price) if ind_price is not None else "N/A"
+            bat_str = fmt(bat_price) if bat_price is not None else "N/A"
             match = "✓" if ind_price == bat_price else "✗"
-            print(f"{symbol:<13} | {ind_str:<13} | {bat_str:<13} | {match}")
+            print(row(symbol, ind_str, bat_str, match))
         
         print("=" * 58)
         
-        # Verify results
-        all_successful = all(
-            individual_prices.get(symbol) is not None and 
-            batch_prices.get(symbol) is not None
-            for symbol in MAIN_TRADING_PAIRS
-        )
-        
         if all_successful:
             print("\n✅ All price fetches successful!")
+            return 0
         else:
             print("\n❌ Some price fetches failed!")
+            return 1
     finally:
         # Ensure we close the session
         logger.info("Cleaning up client session...")
@@ -124,13 +129,19 @@ async def main():
             await market.close()
 
 if __name__ == "__main__":
+    # Load environment variables
+    load_dotenv()
+    
+    # Use uvloop's faster event loop when it is installed
     try:
-        # Load environment variables
-        load_dotenv()
-        
-        # Run the test
-        asyncio.run(main())
-    except KeyboardInterrupt:
-        logger.info("Test interrupted by user")
-    except Exception as e:
-        logger.error(f"Unexpected error: {e}", exc_info=True) 
\ No newline at end of file
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        pass
+    
+    try:
+        # Run the test; the exit code reports whether every price fetch succeeded
+        sys.exit(asyncio.run(main()))
+    finally:
+        # Flush any queued log records
+        log_listener.stop()